@@ -1,7 +1,17 @@
-from src import main
+import sys
+
+from src import selected_command
 from src.logger import logger
+from src.metrics import metrics
 import src.timer as timer
 
 
 if __name__ == "__main__":
-    logger.debug(f"{ main } returned code: { timer.timer(main) }")
+    command = selected_command()
+    code = None
+    try:
+        code = timer.timer(command)
+        logger.debug(f"{ command } returned code: { code }")
+    finally:
+        metrics.export()
+    sys.exit(code)
@@ -1,5 +1,6 @@
-import requests
-from typing import List, Any, Type
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Set
 
 from .file_handler import *
 from .functions import *
@@ -7,15 +8,25 @@ from .lang_helper import *
 from .logger import *
 from .const import *
 from .var import *
-
-SWAPI = "https://swapi.dev/api"
-ResponseType = Type[requests.Response]
+from .args import args
+from .metrics import metrics
+from .fetch import *
+from .analytics import *
+from .entity import *
+from .crawler import crawl_main, load_store, Store
+from .routes import resource_id
+from .bench import bench_main, bench_record_main
+from .cassette import with_cassette
+from .export import export_main
+from .log_analysis import analyze_logs_main
+from .synthetic import synthetic_main
 
 
 def __get_request(route: str, verify: bool = False) -> ResponseType:
     """
-    The function `__get_request` performs an HTTP GET request to the specified `route`, with an optional
-    `verify` parameter to enable/disable SSL certificate verification.
+    The function `__get_request` performs an HTTP GET request to the specified `route` through the
+    fetch layer (`src.fetch`), with an optional `verify` parameter to enable/disable SSL certificate
+    verification.
 
     @param route The `route` parameter is a string specifying the URL to which the GET request will be
     sent.
@@ -25,7 +36,119 @@ def __get_request(route: str, verify: bool = False) -> ResponseType:
     @return The function `__get_request` returns a `Response` object containing the server's response
     to the HTTP GET request.
     """
-    return requests.get(route, verify=verify)
+    return get_request(route, verify=verify)
+
+
+def __arid_films() -> int:
+    """
+    The function `__arid_films` counts, through the API, the films in which arid planets appear.
+    """
+    # Climate is not searchable on SWAPI, so every page of planets is downloaded.
+    api_planet_data: List[Any] = get_all("planets")
+
+    # Initialize a list to store the names of films with arid planets.
+    arid_films: List[Any] = []
+
+    # Gather the films of the arid planets and store every title once.
+    for film_url in sorted(arid_film_urls(api_planet_data)):
+        film_data: Any = __get_request(film_url).json()
+        if film_data["title"] not in arid_films:
+            arid_films.append(film_data["title"])
+
+    return len(arid_films)
+
+
+def __wookiees() -> int:
+    """
+    The function `__wookiees` counts, through the API, the Wookiees of the whole saga.
+    """
+    # Initialize a variable to store the count of Wookiees.
+    wookie_count: int = 0
+
+    # The species name is searchable, so only the matching species are downloaded.
+    for species in get_where("species", "name", "Wookiee"):
+        # Counting lazy references needs the URLs only, no character is fetched.
+        wookie_count += len(set(refs(species["people"])))
+
+    return wookie_count
+
+
+def __smallest_starship() -> Any:
+    """
+    The function `__smallest_starship` returns, through the API, the name of the smallest starship of
+    the first film.
+    """
+    # Search the first film and fetch only the starships that appear in it.
+    first_film: List[Any] = get_where("films", "title", "A New Hope", "contains")
+    first_film_urls: Set[str] = {film["url"] for film in first_film}
+    # The starships are fetched together, on the first read of a field other than the URL.
+    starships: List[Entity] = [
+        starship for film in first_film for starship in refs(film["starships"])
+    ]
+    return smallest_starship(starships, first_film_urls)[1]
+
+
+def __store_questions(store: Store) -> Dict[int, Callable[[], Any]]:
+    """
+    The function `__store_questions` returns the three questions answered from a store written by the
+    crawler, without any request.
+
+    @param store The `store` parameter is the store returned by `load_store`.
+
+    @return The function `__store_questions` returns the questions by placeholder number.
+    """
+    films: Dict[int, Any] = store.get("films", {})
+    return {
+        # The store is keyed by ID, so every film title is a lookup.
+        1: lambda: len(
+            {
+                films[index]["title"]
+                for index in map(
+                    resource_id, arid_film_urls(store.get("planets", {}).values())
+                )
+                if index is not None
+            }
+        ),
+        2: lambda: species_people_count(store.get("species", {}).values(), "Wookiee"),
+        3: lambda: smallest_starship(
+            store.get("starships", {}).values(),
+            film_urls_titled(films.values(), "A New Hope"),
+        )[1],
+    }
+
+
+def __answer(questions: Dict[int, Callable[[], Any]], template: str) -> Dict[int, Any]:
+    """
+    The function `__answer` runs the independent questions concurrently and renders the template again
+    each time one of them is answered, so the first answer shows after the fastest question instead of
+    after all of them. Unanswered slots show `…`; the screen is redrawn only on a terminal, so piped
+    output gets the final text once.
+
+    @param questions The `questions` parameter maps the number of each `<ans.N>` placeholder to the
+    function computing its answer.
+    @param template The `template` parameter is the text loaded from the language file.
+
+    @return The function `__answer` returns the answers by placeholder number.
+    """
+    answers: Dict[int, Any] = {}
+    progressive: bool = sys.stdout.isatty()
+    with ThreadPoolExecutor(
+        max_workers=len(questions), thread_name_prefix="question"
+    ) as executor:
+        futures: Dict["Future[Any]", int] = {
+            executor.submit(question): number for number, question in questions.items()
+        }
+        if progressive:
+            clear_terminal()
+            prt(render_answers(template, answers, pending="…"))
+        for future in as_completed(futures):
+            number: int = futures[future]
+            answers[number] = future.result()
+            logger.info(f"<ans.{number}>: {answers[number]}")
+            if progressive:
+                clear_terminal()
+                prt(render_answers(template, answers, pending="…"))
+    return dict(sorted(answers.items()))
 
 
 def main() -> int:
@@ -37,78 +160,59 @@ def main() -> int:
 
     logger_specials.value_was_set("var.global_str", f"\n{var.global_str}\n")
 
-    # Perform a GET request to fetch the lists.
-    api_planet_response: ResponseType = __get_request(f"{SWAPI}/planets")
-    api_planet_data: Any = api_planet_response.json()
-    api_starships_response: ResponseType = __get_request(f"{SWAPI}/starships")
-    api_starships_data: Any = api_starships_response.json()
-
-    # Initialize a list to store the names of films with arid planets.
-    arid_films: List[Any] = []
-
-    # Iterate over each planet and check if its climate is arid.
-    for planet in api_planet_data["results"]:
-        if "arid" in planet["climate"].lower():
-            # If the climate is arid, gather information about the films it appears in.
-            for film_url in planet["films"]:
-                film_response: ResponseType = __get_request(film_url)
-                film_data: Any = film_response.json()
-                # Store the film title if it's not already in the list.
-                if film_data["title"] not in arid_films:
-                    arid_films.append(film_data["title"])
-
-    arid_films_values: int = len(arid_films)
-    # log the number of films with arid planets.
-    logger.info(arid_films_values)
-
-    # Initialize a variable to store the count of Wookiees.
-    wookie_count: int = 0
-
-    # Iterate over each species and check if it's Wookiee.
-    for species in api_planet_data["results"]:
-        if species["name"] == "Wookiee":
-            # Gather information about characters belonging to the Wookiee species.
-            for character_url in species["people"]:
-                character_response: ResponseType = __get_request(character_url)
-                character_data: Any = character_response.json()
-                # Increment the Wookiee count.
-                wookie_count += 1
-
-    # log the number of Wookiees across the saga.
-    logger.info(wookie_count)
-
-    # Initialize variables to store the name and size of the smallest starship.
-    smallest_starship_name: Any = None
-    # Initialize with an infinite value for comparison.
-    smallest_starship_size = float("inf")
-
-    # Iterate over each starship and check if it appears in the first film.
-    for starship in api_starships_data["results"]:
-        # Fetch the film data
-        films: List[Any] = [
-            __get_request(film_url).json() for film_url in starship["films"]
-        ]
-        # Check if "A New Hope" appears in any of the films
-        if any("A New Hope" in film["title"] for film in films):
-            # Compare the length of the starship with the current smallest size.
-            STARSHIP_VALID_FLOAT = float(starship["length"].replace(",", ""))
-            if STARSHIP_VALID_FLOAT < smallest_starship_size:
-                smallest_starship_size = STARSHIP_VALID_FLOAT
-                smallest_starship_name = starship["name"]
-
-    # log the name of the smallest starship in the first film.
-    logger.info(smallest_starship_name)
+    questions: Dict[int, Callable[[], Any]] = {
+        1: __arid_films,
+        2: __wookiees,
+        3: __smallest_starship,
+    }
+    # A crawled store answers everything from one bulk load, without any request.
+    if args.store:
+        try:
+            questions = __store_questions(load_store(args.store))
+        except ValueError as error:
+            logger.error(error)
+            prt(error)
+            return 1
+    answers: Dict[int, Any] = __answer(questions, var.global_str)
 
     # Set the global string variable by replacing placeholders with provided answers.
-    var.global_str = (
-        var.global_str.replace("<ans.1>", str(arid_films_values))
-        .replace("<ans.2>", str(wookie_count))
-        .replace("<ans.3>", str(smallest_starship_name))
-    )
+    var.global_str = render_answers(var.global_str, answers)
 
     logger_specials.value_was_set("var.global_str", f"\n{var.global_str}\n")
 
-    clear_terminal()
-    prt(var.global_str)
+    # On a terminal, the last redraw of `__answer` already shows the complete text.
+    if not sys.stdout.isatty():
+        prt(var.global_str)
 
     return 0
+
+
+commands: Dict[str, Callable[[], int]] = {
+    "main": main,
+    "crawl": crawl_main,
+    "export": export_main,
+    "synthetic": synthetic_main,
+    "analyze": analyze_main,
+    "analyzeLogs": analyze_logs_main,
+    "bench": bench_main,
+    "benchCompare": bench_main,
+    "benchRecord": bench_record_main,
+}
+"""
+This dictionary maps every command to its entry point; `main` runs unless another command was
+requested on the command line.
+"""
+
+
+def selected_command() -> Callable[[], int]:
+    """
+    The function `selected_command` returns the entry point of the command requested on the command
+    line, falling back to `main`, recording or replaying its traffic when `-record` or `-replay`
+    was given.
+
+    @return The callable to be executed (and timed) by `main.py`.
+    """
+    for name, command in commands.items():
+        if getattr(args, name, ""):
+            return with_cassette(command)
+    return with_cassette(main)
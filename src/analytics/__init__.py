@@ -0,0 +1,259 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = [
+    "arid_film_urls",
+    "species_people_count",
+    "smallest_starship",
+    "film_urls_titled",
+    "analyze_dataset",
+    "scaling_report",
+    "analyze_main",
+]
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+from src.args import args
+from src.functions import *
+from src.logger import *
+from src.routes import resource_key
+from src.synthetic import dataset_file
+
+StarshipSize = Tuple[float, Any]
+
+
+def arid_film_urls(planets: Iterable[Any]) -> Set[str]:
+    """
+    The function `arid_film_urls` collects the URLs of the films in which planets with an arid climate
+    appear.
+
+    @param planets The `planets` parameter is an iterable of SWAPI planet records.
+
+    @return A set with the film URLs. Sets of several shards are merged with a union.
+    """
+    films: Set[str] = set()
+    for planet in planets:
+        if "arid" in planet["climate"].lower():
+            films.update(planet["films"])
+    return films
+
+
+def species_people_count(species: Iterable[Any], name: str = "Wookiee") -> int:
+    """
+    The function `species_people_count` counts the people that belong to the species called `name`.
+
+    @param species The `species` parameter is an iterable of SWAPI species records.
+    @param name The `name` parameter is the exact name of the species to count.
+
+    @return The number of people. Counts of several shards are merged with a sum.
+    """
+    return sum(len(kind["people"]) for kind in species if kind["name"] == name)
+
+
+def smallest_starship(starships: Iterable[Any], film_urls: Set[str]) -> StarshipSize:
+    """
+    The function `smallest_starship` finds the shortest starship that appears in any of `film_urls`.
+
+    @param starships The `starships` parameter is an iterable of SWAPI starship records.
+    @param film_urls The `film_urls` parameter is the set of film URLs the starship must appear in.
+    URLs are compared by resource type and ID, not by host.
+
+    @return A `(length, name)` tuple, `(inf, None)` if no starship matched. Tuples of several shards
+    are merged with `min`.
+    """
+    smallest: StarshipSize = (float("inf"), None)
+    films: Set[str] = {resource_key(url) for url in film_urls}
+    for starship in starships:
+        if films.isdisjoint(resource_key(url) for url in starship["films"]):
+            continue
+        try:
+            length: float = float(starship["length"].replace(",", ""))
+        except ValueError:
+            continue
+        if length < smallest[0]:
+            smallest = (length, starship["name"])
+    return smallest
+
+
+def film_urls_titled(films: Iterable[Any], title: str) -> Set[str]:
+    """
+    The function `film_urls_titled` returns the URLs of the films whose title contains `title`.
+    """
+    return {film["url"] for film in films if title in film["title"]}
+
+
+def __read_records(file_name: str, start: int = 0, end: int = -1) -> Iterable[Any]:
+    """
+    The function `__read_records` yields the JSON-lines records whose line starts within the byte
+    range [`start`, `end`) of `file_name`. Every line belongs to exactly one range.
+    """
+    with open(file_name, "rb") as file_object:
+        if start > 0:
+            file_object.seek(start - 1)
+            # Skip the line that started in the previous shard.
+            file_object.readline()
+        while end < 0 or file_object.tell() < end:
+            line: bytes = file_object.readline()
+            if not line:
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def __shard_ranges(file_name: str, shards: int) -> List[Tuple[int, int]]:
+    size: int = os.path.getsize(file_name)
+    step: int = max(size // max(shards, 1), 1)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _scan_shard(
+    task: str, file_name: str, start: int, end: int, param: Any
+) -> Tuple[Any, int]:
+    """
+    The function `_scan_shard` runs one analysis over a byte range of a dataset file inside a worker
+    process, returning its partial result and the number of records scanned.
+    """
+    records: List[Any] = []
+    scanned: int = 0
+    partial: Any = None
+    tasks: Dict[str, Callable[[List[Any]], Any]] = {
+        "arid": lambda chunk: arid_film_urls(chunk),
+        "species": lambda chunk: species_people_count(chunk, param),
+        "smallest": lambda chunk: smallest_starship(chunk, param),
+    }
+    merges: Dict[str, Callable[[Any, Any], Any]] = {
+        "arid": lambda a, b: a | b,
+        "species": lambda a, b: a + b,
+        "smallest": lambda a, b: min(a, b, key=lambda size: size[0]),
+    }
+    for record in __read_records(file_name, start, end):
+        records.append(record)
+        if len(records) == 10_000:
+            value: Any = tasks[task](records)
+            partial = value if partial is None else merges[task](partial, value)
+            scanned += len(records)
+            records = []
+    value = tasks[task](records)
+    partial = value if partial is None else merges[task](partial, value)
+    return partial, scanned + len(records)
+
+
+def analyze_dataset(path: str, workers: int) -> Dict[str, Any]:
+    """
+    The function `analyze_dataset` answers the three questions of `main` over a synthetic dataset,
+    sharding every file by byte ranges over a process pool and merging the partial results.
+
+    @param path The `path` parameter is the directory of a dataset written by `generate_dataset`.
+    @param workers The `workers` parameter is the number of worker processes (and shards per file).
+
+    @return A dictionary with the three answers (`arid_films`, `wookiees`, `smallest_starship`) and
+    the number of `records` scanned.
+    """
+    logger_specials.was_called(__name__, analyze_dataset.__name__)
+    # The films are few; they are read in the parent to resolve titles and the first film.
+    films: List[Any] = list(__read_records(dataset_file(path, "films")))
+    titles: Dict[str, str] = {film["url"]: film["title"] for film in films}
+    first_film: Set[str] = film_urls_titled(films, "A New Hope")
+    jobs: List[Tuple[str, str, Any]] = [
+        ("arid", "planets", None),
+        ("species", "species", "Wookiee"),
+        ("smallest", "starships", first_film),
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: Dict[str, List[Any]] = {
+            task: [
+                executor.submit(
+                    _scan_shard, task, dataset_file(path, resource), start, end, param
+                )
+                for start, end in __shard_ranges(dataset_file(path, resource), workers)
+            ]
+            for task, resource, param in jobs
+        }
+        partials: Dict[str, List[Tuple[Any, int]]] = {
+            task: [future.result() for future in shards]
+            for task, shards in futures.items()
+        }
+
+    arid: Set[str] = set().union(*(value for value, _ in partials["arid"]))
+    smallest: StarshipSize = min(
+        (value for value, _ in partials["smallest"]), key=lambda size: size[0]
+    )
+    result: Dict[str, Any] = {
+        "arid_films": len({titles.get(url, url) for url in arid}),
+        "wookiees": sum(value for value, _ in partials["species"]),
+        "smallest_starship": smallest[1],
+        "records": len(films)
+        + sum(scanned for shards in partials.values() for _, scanned in shards),
+    }
+    logger_specials.value_retured("result", result, analyze_dataset)
+    return result
+
+
+def scaling_report(path: str, cores: List[int]) -> List[Dict[str, Any]]:
+    """
+    The function `scaling_report` runs `analyze_dataset` once per core count and measures its
+    throughput.
+
+    @param path The `path` parameter is the directory of a dataset written by `generate_dataset`.
+    @param cores The `cores` parameter is the list of worker counts to measure.
+
+    @return A list with one dictionary per core count holding `cores`, `seconds`, `records` and
+    `records_per_second`.
+    """
+    logger_specials.was_called(__name__, scaling_report.__name__)
+    report: List[Dict[str, Any]] = []
+    for workers in cores:
+        start: float = time.perf_counter()
+        result: Dict[str, Any] = analyze_dataset(path, workers)
+        seconds: float = time.perf_counter() - start
+        row: Dict[str, Any] = {
+            "cores": workers,
+            "seconds": round(seconds, 3),
+            "records": result["records"],
+            "records_per_second": round(result["records"] / seconds, 1),
+        }
+        logger.info(f"Analytics throughput: {row}, answers: {result}")
+        report.append(row)
+    return report
+
+
+def __default_cores() -> List[int]:
+    cpus: int = os.cpu_count() or 1
+    cores: List[int] = []
+    workers: int = 1
+    while workers < cpus:
+        cores.append(workers)
+        workers *= 2
+    return cores + [cpus]
+
+
+def analyze_main() -> int:
+    """
+    The function `analyze_main` prints the throughput per core count of the dataset given through the
+    `-analyze` and `-cores` command line arguments.
+
+    @return The function `analyze_main` returns 0 once the report is printed.
+    """
+    logger_specials.was_called(__name__, analyze_main.__name__)
+    cores: List[int] = (
+        [int(value) for value in args.cores.split(",")]
+        if args.cores
+        else __default_cores()
+    )
+    for row in scaling_report(args.analyze, cores):
+        prt(
+            f"cores: {row['cores']:>3}, seconds: {row['seconds']:>9}, "
+            f"records/s: {row['records_per_second']:>12}"
+        )
+    return 0
@@ -0,0 +1,308 @@
+__all__ = ["args"]
+
+import argparse
+from argparse import (
+    Namespace,
+)
+
+
+def __parse_args() -> Namespace:
+    parser = argparse.ArgumentParser(
+        prog="SWAPI-Explorer-API/main.py",
+    )
+
+    parser.add_argument(
+        "-EN",
+        default=False,
+        action="store_true",
+        help="(BOOLEAN) - Set the API output responses to English. (Default is False)",
+    )
+
+    parser.add_argument(
+        "-ES",
+        default=False,
+        action="store_true",
+        help="(BOOLEAN) - Establece las respuestas de salida de la API en español. "
+        "(El valor predeterminado es False)",
+    )
+
+    parser.add_argument(
+        "-synthetic",
+        default="",
+        metavar="DIR",
+        help="(PATH) - Generate a synthetic SWAPI-shaped dataset into DIR and exit.",
+    )
+
+    parser.add_argument(
+        "-syntheticSize",
+        default=1_000_000,
+        type=int,
+        metavar="N",
+        help="(INT) - Number of planets, people and starships of the synthetic dataset. "
+        "(Default is 1000000)",
+    )
+
+    parser.add_argument(
+        "-analyze",
+        default="",
+        metavar="DIR",
+        help="(PATH) - Run the process-pool analytics over the synthetic dataset in DIR "
+        "and report the throughput per core count.",
+    )
+
+    parser.add_argument(
+        "-cores",
+        default="",
+        metavar="N,N,...",
+        help="(LIST) - Comma separated core counts used by '-analyze'. "
+        "(Default is 1, 2, 4, ... up to the CPU count)",
+    )
+
+    parser.add_argument(
+        "-analyzeLogs",
+        default=False,
+        action="store_true",
+        help="(BOOLEAN) - Analyze every log file, compressed ones included, and report the "
+        "operation time percentiles and the error-rate trend. (Default is False)",
+    )
+
+    parser.add_argument(
+        "-analyzeLogsPath",
+        default="",
+        metavar="DIR",
+        help="(PATH) - Directory analyzed by '-analyzeLogs'. (Default is the log directory)",
+    )
+
+    parser.add_argument(
+        "-analyzeLogsByHour",
+        default=False,
+        action="store_true",
+        help="(BOOLEAN) - Group the error-rate trend of '-analyzeLogs' by hour instead of by day. "
+        "(Default is False)",
+    )
+
+    parser.add_argument(
+        "-bench",
+        default="",
+        metavar="LABEL",
+        help="(STRING) - Run the benchmark suite and store it as the baseline LABEL.",
+    )
+
+    parser.add_argument(
+        "-benchCompare",
+        default="",
+        metavar="LABEL",
+        help="(STRING) - Run the benchmark suite and compare it with the baseline LABEL. "
+        "Exits with 1 when a significant slowdown is found.",
+    )
+
+    parser.add_argument(
+        "-benchFixtures",
+        default="",
+        metavar="FILE",
+        help="(PATH) - Cassette (written by -benchRecord or -record) replayed by the end-to-end "
+        "benchmark of the main function.",
+    )
+
+    parser.add_argument(
+        "-benchRuns",
+        default=10,
+        type=int,
+        metavar="N",
+        help="(INT) - Number of separate processes the benchmark suite is run in; each gives one "
+        "sample per case. (Default is 10)",
+    )
+
+    parser.add_argument(
+        "-benchRecord",
+        default="",
+        metavar="FILE",
+        help="(PATH) - Run the main function against the API and record its traffic to the "
+        "cassette FILE.",
+    )
+
+    parser.add_argument(
+        "-timeout",
+        default=30.0,
+        type=float,
+        metavar="SECONDS",
+        help="(FLOAT) - Seconds to wait for a response before the request is retried; 0 waits "
+        "indefinitely. (Default is 30)",
+    )
+
+    parser.add_argument(
+        "-hedge",
+        default=False,
+        action="store_true",
+        help="(BOOLEAN) - Duplicate the requests that are slower than usual and keep the first "
+        "answer. (Default is False)",
+    )
+
+    parser.add_argument(
+        "-hedgePercentile",
+        default=95.0,
+        type=float,
+        metavar="P",
+        help="(FLOAT) - Latency percentile of the recent requests after which a request is "
+        "hedged. (Default is 95)",
+    )
+
+    parser.add_argument(
+        "-hedgeBudget",
+        default=0.1,
+        type=float,
+        metavar="FRACTION",
+        help="(FLOAT) - Maximum number of hedges, as a fraction of the requests sent. "
+        "(Default is 0.1)",
+    )
+
+    parser.add_argument(
+        "-hedgeBurst",
+        default=2,
+        type=int,
+        metavar="COUNT",
+        help="(INT) - Number of hedges allowed on top of -hedgeBudget, so the first requests "
+        "of a run can be hedged. (Default is 2)",
+    )
+
+    parser.add_argument(
+        "-hedgeMinSamples",
+        default=20,
+        type=int,
+        metavar="N",
+        help="(INT) - Number of latencies an endpoint type needs before -hedgePercentile is used. "
+        "(Default is 20)",
+    )
+
+    parser.add_argument(
+        "-hedgeDelay",
+        default=1.0,
+        type=float,
+        metavar="SECONDS",
+        help="(FLOAT) - Hedge delay of an endpoint type with fewer than -hedgeMinSamples "
+        "latencies; 0 disables hedging until then. (Default is 1)",
+    )
+
+    parser.add_argument(
+        "-hedgeMirror",
+        default="",
+        metavar="URL",
+        help="(URL) - Base URL of a SWAPI mirror the hedges are sent to. (Default is the same host)",
+    )
+
+    parser.add_argument(
+        "-mirrors",
+        default="",
+        metavar="URL,URL,...",
+        help="(LIST) - Comma separated base URLs of SWAPI-compatible mirrors. Requests go to the "
+        "fastest healthy one. (Default is the public SWAPI only)",
+    )
+
+    parser.add_argument(
+        "-mirrorCooldown",
+        default=30.0,
+        type=float,
+        metavar="SECONDS",
+        help="(FLOAT) - Seconds a failing mirror is ejected before it is probed again. "
+        "(Default is 30)",
+    )
+
+    parser.add_argument(
+        "-flightRecorder",
+        default=0,
+        type=int,
+        metavar="N",
+        help="(INT) - Keep the last N debug and info records in memory and write only warnings "
+        "and errors to the log file; the records are dumped on an exception, SIGUSR1 or SIGTERM. "
+        "(Default is 0, disabled)",
+    )
+
+    parser.add_argument(
+        "-crawl",
+        default="",
+        metavar="DIR",
+        help="(PATH) - Crawl the whole SWAPI graph into the store DIR, resuming an interrupted "
+        "crawl from its checkpoint. (Default is disabled)",
+    )
+
+    parser.add_argument(
+        "-crawlWorkers",
+        default=8,
+        type=int,
+        metavar="N",
+        help="(INT) - Number of concurrent requests of the crawler. (Default is 8)",
+    )
+
+    parser.add_argument(
+        "-store",
+        default="",
+        metavar="DIR",
+        help="(PATH) - Answer the questions from the store written by -crawl instead of the "
+        "API. (Default is disabled)",
+    )
+
+    parser.add_argument(
+        "-export",
+        default="",
+        metavar="DIR",
+        help="(PATH) - Export every resource type into DIR as typed columns, from the -store "
+        "DIR if given, otherwise from the API. Needs pyarrow. (Default is disabled)",
+    )
+
+    parser.add_argument(
+        "-exportFormat",
+        default="arrow",
+        choices=["arrow", "parquet"],
+        help="(STR) - File format of -export: Arrow IPC or Parquet. (Default is arrow)",
+    )
+
+    parser.add_argument(
+        "-record",
+        default="",
+        metavar="FILE",
+        help="(PATH) - Record every request of the run, with its response and latency, to the "
+        "cassette FILE (gzipped JSON lines). (Default is disabled)",
+    )
+
+    parser.add_argument(
+        "-replay",
+        default="",
+        metavar="FILE",
+        help="(PATH) - Serve every request of the run from the cassette FILE instead of the "
+        "network. (Default is disabled)",
+    )
+
+    parser.add_argument(
+        "-replaySpeed",
+        default=1.0,
+        type=float,
+        metavar="FACTOR",
+        help="(FLOAT) - Divide the recorded latencies by FACTOR on replay; 0 replays at full "
+        "speed. (Default is 1, the recorded latencies)",
+    )
+
+    parser.add_argument(
+        "-aggregateCalls",
+        default=False,
+        action="store_true",
+        help="(BOOLEAN) - Count the calls logged by was_called, from_specific and value_was_set per "
+        "(module, function) in memory and write summary lines instead of one line per call. "
+        "(Default is disabled)",
+    )
+
+    parser.add_argument(
+        "-aggregateInterval",
+        default=0.0,
+        type=float,
+        metavar="SECONDS",
+        help="(FLOAT) - Seconds between two call summaries of -aggregateCalls. "
+        "(Default is 0, one summary at exit)",
+    )
+
+    return parser.parse_args()
+
+
+args: Namespace = __parse_args()
+"""
+This namespace holds the command line arguments, parsed once when the package is imported.
+"""
@@ -0,0 +1,402 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = [
+    "BASELINE_VERSION",
+    "run_suite",
+    "save_baseline",
+    "load_baseline",
+    "compare",
+    "record_fixtures",
+    "bench_main",
+    "bench_record_main",
+]
+
+import contextlib
+import io
+import json
+import logging
+import math
+import platform
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.args import args
+from src.cassette import Cassette
+from src.const import *
+from src.fetch import *
+from src.file_handler import *
+from src.functions import *
+from src.lang_helper import *
+from src.logger import *
+from src.var import _random64
+import src.timer as timer
+
+BASELINE_VERSION: int = 2
+"""
+The format version of the stored baselines. Baselines of another version are not compared.
+"""
+
+Case = Callable[[], Any]
+
+__MIN_SAMPLE_SECONDS: float = 0.01
+__ALPHA: float = 0.01
+
+
+def __calibrate(case: Case) -> int:
+    """
+    The function `__calibrate` returns how many calls make a sample last at least
+    `__MIN_SAMPLE_SECONDS`, so cheap cases are not dominated by the timer resolution.
+    """
+    number: int = 1
+    while number < 100_000:
+        start: float = time.perf_counter()
+        for _ in range(number):
+            case()
+        if time.perf_counter() - start >= __MIN_SAMPLE_SECONDS:
+            break
+        number *= 2
+    return number
+
+
+def __measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """
+    The function `__measure` returns `repeat` samples of the mean time per call of `case`.
+    """
+    number: int = __calibrate(case)
+    samples: List[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        for _ in range(number):
+            case()
+        samples.append((time.perf_counter() - start) / number)
+    return {"number": number, "samples": samples}
+
+
+def __main_case(cassette: Cassette) -> Case:
+    """
+    The function `__main_case` returns a case that runs `main` end to end against a cassette replayed
+    at full speed, with a cold response cache and its terminal output discarded, so the case
+    measures the client only.
+    """
+    from src import main
+
+    def case() -> None:
+        clear_cache()
+        previous: Transport = use_transport(cassette.player(speed=0))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                main()
+        finally:
+            use_transport(previous)
+
+    return case
+
+
+def __cases(fixtures: str) -> Dict[str, Tuple[Case, int]]:
+    """
+    The function `__cases` returns every benchmark case with its number of samples.
+    """
+    template: str = lang_values["en"]()
+    lang_file: str = f"{LANG_PATH}/en.txt"
+    cases: Dict[str, Tuple[Case, int]] = {
+        "logger.debug": (lambda: logger.debug("benchmark"), 10),
+        "logger_specials.was_called": (
+            lambda: logger_specials.was_called(__name__, "bench"),
+            10,
+        ),
+        "timer.timer": (lambda: timer.timer(int), 10),
+        "file_handler.load_file": (lambda: load_file(lang_file), 10),
+        "lang_helper.render_answers": (
+            lambda: render_answers(template, {1: 6, 2: 3, 3: "Starship"}),
+            10,
+        ),
+        "var._random64": (_random64, 10),
+    }
+    if fixtures:
+        cases["main"] = (__main_case(Cassette.load(fixtures)), 5)
+    else:
+        logger.warning("No fixtures were given, the end-to-end 'main' case is skipped.")
+    return cases
+
+
+def _run_once(fixtures: str) -> Dict[str, Tuple[int, float]]:
+    """
+    The function `_run_once` measures every case once, in the worker process it runs in.
+
+    @return The function `_run_once` returns the calls per sample and the median seconds per call of
+    every case.
+    """
+    # The logging cases measure the logging calls, not the writes to the log file of the run.
+    previous: logging.Handler = logger.use_handler(logging.NullHandler())
+    try:
+        medians: Dict[str, Tuple[int, float]] = {}
+        for name, (case, repeat) in __cases(fixtures).items():
+            measured: Dict[str, Any] = __measure(case, repeat)
+            medians[name] = (
+                measured["number"],
+                statistics.median(measured["samples"]),
+            )
+    finally:
+        logger.use_handler(previous)
+    return medians
+
+
+def run_suite(fixtures: str = "", runs: int = 10) -> Dict[str, Any]:
+    """
+    The function `run_suite` measures every benchmark case in `runs` separate worker processes. The
+    timings of one process drift together (CPU placement, frequency, memory layout), so samples of a
+    single process are not independent; each run contributes one sample, its median.
+
+    @param fixtures The `fixtures` parameter is a cassette written by `record_fixtures` or `-record`.
+    The end-to-end `main` case only runs when it is given.
+    @param runs The `runs` parameter is the number of separate runs, each in a new process.
+
+    @return The function `run_suite` returns a dictionary mapping each case name to its calls per
+    sample (`number`) and its `samples`: the median seconds per call of every run.
+    """
+    logger_specials.was_called(__name__, run_suite.__name__)
+    results: Dict[str, Any] = {}
+    for _ in range(runs):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            medians: Dict[str, Tuple[int, float]] = executor.submit(
+                _run_once, fixtures
+            ).result()
+        for name, (number, median) in medians.items():
+            result: Dict[str, Any] = results.setdefault(name, {"samples": []})
+            result["number"] = number
+            result["samples"].append(median)
+    for name, result in results.items():
+        logger.info(
+            f"Benchmark {name}: median {statistics.median(result['samples']):.3e} s/call "
+            f"over {len(result['samples'])} runs."
+        )
+    return results
+
+
+def __baseline_file(label: str) -> str:
+    return f"{BENCH_PATH}/{label}.json"
+
+
+def save_baseline(label: str, results: Dict[str, Any]) -> str:
+    """
+    The function `save_baseline` stores the results of `run_suite` as the baseline `label`, together
+    with the environment they were measured in.
+
+    @return The function `save_baseline` returns the baseline file name.
+    """
+    create_directory(BENCH_PATH)
+    baseline: Dict[str, Any] = {
+        "version": BASELINE_VERSION,
+        "label": label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": results,
+    }
+    write_file(__baseline_file(label), json.dumps(baseline, indent=2))
+    return __baseline_file(label)
+
+
+def load_baseline(label: str) -> Dict[str, Any]:
+    """
+    The function `load_baseline` loads the baseline `label`.
+
+    @return The function `load_baseline` returns the stored cases, or an empty dictionary if the
+    baseline does not exist or has another format version.
+    """
+    content: str = load_file(__baseline_file(label))["content"]
+    if not content:
+        return {}
+    baseline: Any = json.loads(content)
+    if baseline.get("version") != BASELINE_VERSION:
+        logger.error(
+            f"Baseline '{label}' has version {baseline.get('version')}, "
+            f"expected {BASELINE_VERSION}."
+        )
+        return {}
+    return baseline["cases"]
+
+
+def __mann_whitney(base: List[float], candidate: List[float]) -> float:
+    """
+    The function `__mann_whitney` returns the two-sided p-value of the Mann-Whitney U test between two
+    samples (normal approximation with tie correction). Timing samples are rarely normal, so a rank
+    test is used instead of a t-test.
+    """
+    values: List[Tuple[float, int]] = sorted(
+        [(value, 0) for value in base] + [(value, 1) for value in candidate]
+    )
+    ranks: List[float] = [0.0] * len(values)
+    ties: float = 0.0
+    index: int = 0
+    while index < len(values):
+        end: int = index
+        while end + 1 < len(values) and values[end + 1][0] == values[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        tied: int = end - index + 1
+        ties += tied**3 - tied
+        index = end + 1
+
+    n1, n2 = len(base), len(candidate)
+    total: int = n1 + n2
+    rank_sum: float = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u: float = rank_sum - n1 * (n1 + 1) / 2
+    sigma: float = math.sqrt(
+        n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    )
+    if sigma == 0:
+        return 1.0
+    z: float = (u - n1 * n2 / 2) / sigma
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def __smallest_p_value(n1: int, n2: int) -> float:
+    """
+    The function `__smallest_p_value` returns the smallest p-value `__mann_whitney` can give for
+    samples of `n1` and `n2` runs, reached when every run of one sample is slower than every run of
+    the other. With too few runs it stays above the significance level, and no regression can be
+    flagged.
+    """
+    return __mann_whitney(
+        [float(run) for run in range(n1)], [float(n1 + run) for run in range(n2)]
+    )
+
+
+def compare(
+    base: Dict[str, Any],
+    candidate: Dict[str, Any],
+    alpha: float = __ALPHA,
+    threshold: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """
+    The function `compare` compares every case present in both result sets. A case is flagged as a
+    regression when its slowdown is statistically significant (Mann-Whitney U p-value below `alpha`)
+    and its median grew by more than `threshold`. The samples compared are the medians of separate
+    runs, so the test measures the difference between runs, not the noise within one.
+
+    @param base The `base` parameter holds the baseline results.
+    @param candidate The `candidate` parameter holds the results being checked.
+    @param alpha The `alpha` parameter is the significance level.
+    @param threshold The `threshold` parameter is the relative slowdown ignored as noise.
+
+    @return The function `compare` returns one dictionary per case with both medians, their `ratio`,
+    the `p_value` and whether it is a `regression`.
+    """
+    rows: List[Dict[str, Any]] = []
+    for name in candidate:
+        if name not in base:
+            continue
+        base_median: float = statistics.median(base[name]["samples"])
+        candidate_median: float = statistics.median(candidate[name]["samples"])
+        ratio: float = candidate_median / base_median if base_median else math.inf
+        p_value: float = __mann_whitney(
+            base[name]["samples"], candidate[name]["samples"]
+        )
+        rows.append(
+            {
+                "case": name,
+                "base": base_median,
+                "candidate": candidate_median,
+                "ratio": ratio,
+                "p_value": p_value,
+                "regression": p_value < alpha and ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def record_fixtures(fixtures: str) -> int:
+    """
+    The function `record_fixtures` runs `main` against the live API and records its traffic as a
+    cassette (the format of `-record`) for the end-to-end benchmark.
+
+    @param fixtures The `fixtures` parameter is the cassette file to write.
+
+    @return The function `record_fixtures` returns the number of recorded requests.
+    """
+    from src import main
+
+    cassette: Cassette = Cassette()
+    clear_cache()
+    previous: Transport = use_transport()
+    use_transport(cassette.recorder(previous))
+    try:
+        main()
+    finally:
+        use_transport(previous)
+    cassette.save(fixtures)
+    return len(cassette.entries)
+
+
+def bench_main() -> int:
+    """
+    The function `bench_main` runs the benchmark suite, stores it as the baseline given through
+    `-bench` and compares it with the baseline given through `-benchCompare`.
+
+    @return The function `bench_main` returns 1 when a regression was flagged, or when the baseline
+    cannot be loaded or has too few runs for a regression to be flagged, 0 otherwise, so it can
+    gate a build.
+    """
+    logger_specials.was_called(__name__, bench_main.__name__)
+    base: Dict[str, Any] = {}
+    if args.benchCompare:
+        base = load_baseline(args.benchCompare)
+        if not base:
+            logger.error(f"Baseline '{args.benchCompare}' could not be loaded.")
+            return 1
+        base_runs: int = min(len(case["samples"]) for case in base.values())
+        if __smallest_p_value(base_runs, args.benchRuns) >= __ALPHA:
+            message: str = (
+                f"{base_runs} baseline runs and {args.benchRuns} runs cannot reach a p-value "
+                f"below {__ALPHA}, so no regression could be flagged: use more -benchRuns."
+            )
+            logger.error(message)
+            prt(message)
+            return 1
+
+    results: Dict[str, Any] = run_suite(args.benchFixtures, args.benchRuns)
+    if args.bench:
+        prt(f"Baseline stored: {save_baseline(args.bench, results)}")
+        if __smallest_p_value(args.benchRuns, args.benchRuns) >= __ALPHA:
+            logger.warning(
+                f"Baseline '{args.bench}' has {args.benchRuns} runs: too few to flag a "
+                "regression when compared with the same number of runs."
+            )
+            prt(f"Warning: {args.benchRuns} runs are too few to flag a regression.")
+    if not args.benchCompare:
+        for name, result in results.items():
+            prt(f"{name:<28} {statistics.median(result['samples']):.3e} s/call")
+        return 0
+
+    regressions: int = 0
+    for row in compare(base, results):
+        regressions += row["regression"]
+        prt(
+            f"{row['case']:<28} {row['base']:.3e} -> {row['candidate']:.3e} s/call "
+            f"(x{row['ratio']:.2f}, p={row['p_value']:.4f})"
+            + (" REGRESSION" if row["regression"] else "")
+        )
+        if row["regression"]:
+            logger.warning(f"Benchmark regression: {row}")
+    return 1 if regressions else 0
+
+
+def bench_record_main() -> int:
+    """
+    The function `bench_record_main` records the fixtures given through `-benchRecord`.
+    """
+    logger_specials.was_called(__name__, bench_record_main.__name__)
+    record_fixtures(args.benchRecord)
+    return 0
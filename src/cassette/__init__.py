@@ -0,0 +1,184 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["CASSETTE_SUFFIX", "Cassette", "with_cassette"]
+
+import functools
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+import requests
+
+from src.args import args
+from src.fetch import Transport, make_response, use_transport
+from src.file_handler import *
+from src.logger import *
+from src.routes import route_path
+
+CASSETTE_SUFFIX: str = ".jsonl.gz"
+"""
+The suffix of cassette files: gzipped JSON lines, one header line and then one line per request.
+"""
+
+CASSETTE_VERSION: int = 1
+
+__ERRORS: Dict[str, type] = {
+    "ConnectionError": requests.ConnectionError,
+    "Timeout": requests.Timeout,
+}
+
+
+def _error(name: str) -> Exception:
+    return __ERRORS.get(name, requests.ConnectionError)(f"Replayed {name}.")
+
+
+class Cassette:
+    def __init__(self, entries: List[Dict[str, Any]] | None = None) -> None:
+        """
+        The function initializes a cassette: the requests of a run, in the order they were answered,
+        each with its status, body (or error) and latency.
+
+        @param entries The `entries` parameter is the list of recorded requests, as loaded by `load`.
+        """
+        self.entries: List[Dict[str, Any]] = entries or []
+        self.__lock = threading.Lock()
+        self.__pending: Dict[str, Deque[Dict[str, Any]]] = {}
+
+    @classmethod
+    def load(cls, file_name: str) -> "Cassette":
+        """
+        The function `load` reads a cassette written by `save`.
+
+        @raise ValueError If the file is not a cassette of a supported version.
+        """
+        with gzip.open(file_name, "rt") as file_object:
+            header: Any = json.loads(file_object.readline() or "{}")
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(
+                    f"'{file_name}' is not a cassette of version {CASSETTE_VERSION}."
+                )
+            entries: List[Dict[str, Any]] = [
+                json.loads(line) for line in file_object if line.strip()
+            ]
+        logger.info(f"Cassette '{file_name}' loaded: {len(entries)} requests.")
+        return cls(entries)
+
+    def save(self, file_name: str) -> None:
+        """
+        The function `save` writes the cassette as gzipped JSON lines.
+        """
+        with self.__lock:
+            lines: List[str] = [json.dumps({"version": CASSETTE_VERSION})] + [
+                json.dumps(entry, separators=(",", ":")) for entry in self.entries
+            ]
+        write_file(file_name, gzip.compress(("\n".join(lines) + "\n").encode()), "wb")
+        logger.info(f"Cassette '{file_name}' saved: {len(lines) - 1} requests.")
+
+    def recorder(self, transport: Transport) -> Transport:
+        """
+        The function `recorder` returns a transport that sends every request through `transport` and
+        records it, with its latency, on the cassette. Failed connections and timeouts are recorded
+        too, so they are raised again on replay.
+        """
+
+        def record(route: str, verify: bool) -> Any:
+            start: float = time.perf_counter()
+            entry: Dict[str, Any] = {"route": route_path(route)}
+            try:
+                response: Any = transport(route, verify)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                entry.update(
+                    error=type(error).__name__, seconds=time.perf_counter() - start
+                )
+                self.__append(entry)
+                raise
+            entry.update(
+                status=response.status_code,
+                seconds=time.perf_counter() - start,
+                body=response.content.decode("utf-8", "replace"),
+            )
+            self.__append(entry)
+            return response
+
+        return record
+
+    def __append(self, entry: Dict[str, Any]) -> None:
+        with self.__lock:
+            self.entries.append(entry)
+
+    def player(self, speed: float = 1.0) -> Transport:
+        """
+        The function `player` returns a transport that answers every request from the cassette. The
+        answers of a route are replayed in the recorded order, the last one repeating; a route that
+        was never recorded gets a 404.
+
+        @param speed The `speed` parameter divides the recorded latencies: 1 waits as long as the
+        recording did, 2 twice less, 0 does not wait at all.
+        """
+        with self.__lock:
+            self.__pending = {}
+            for entry in self.entries:
+                self.__pending.setdefault(entry["route"], deque()).append(entry)
+
+        def play(route: str, verify: bool) -> Any:
+            with self.__lock:
+                answers: Deque[Dict[str, Any]] | None = self.__pending.get(
+                    route_path(route)
+                )
+                entry: Dict[str, Any] | None = (
+                    None
+                    if not answers
+                    else answers.popleft() if len(answers) > 1 else answers[0]
+                )
+            if entry is None:
+                logger.warning(f"Cassette has no answer for {route}.")
+                return make_response(route, b'{"detail": "Not found"}', 404)
+            if speed > 0:
+                time.sleep(entry["seconds"] / speed)
+            if "error" in entry:
+                raise _error(entry["error"])
+            return make_response(route, entry["body"].encode(), entry["status"])
+
+        return play
+
+
+def with_cassette(command: Callable[[], int]) -> Callable[[], int]:
+    """
+    The function `with_cassette` wraps a command so that it records its traffic to the cassette given
+    through `-record`, or is served by the cassette given through `-replay` at `-replaySpeed`. Without
+    either flag the command is returned unchanged.
+
+    @param command The `command` parameter is the entry point selected on the command line.
+
+    @return The function `with_cassette` returns the entry point to run.
+    """
+    if not (args.record or args.replay):
+        return command
+
+    @functools.wraps(command)
+    def wrapped() -> int:
+        cassette: Cassette = Cassette.load(args.replay) if args.replay else Cassette()
+        previous: Transport = use_transport()
+        use_transport(
+            cassette.player(args.replaySpeed)
+            if args.replay
+            else cassette.recorder(previous)
+        )
+        try:
+            return command()
+        finally:
+            use_transport(previous)
+            if args.record:
+                cassette.save(args.record)
+
+    return wrapped
@@ -1,4 +1,12 @@
-__all__ = ["ABSOLUTE_PATH", "LOGGER_PATH", "LOGGER_FILE", "SHARED_FILE", "LANG_PATH"]
+__all__ = [
+    "ABSOLUTE_PATH",
+    "LOGGER_PATH",
+    "LOGGER_FILE",
+    "SHARED_FILE",
+    "LANG_PATH",
+    "SWAPI",
+    "BENCH_PATH",
+]
 
 import os as os
 import sys as sys
@@ -34,5 +42,7 @@ SHARED_FILE: str = f"{ABSOLUTE_PATH}/src/bin/random64" + (
     ".dll" if os.name == "nt" else ".so"
 )
 LANG_PATH: str = f"{ABSOLUTE_PATH}/lang"
+BENCH_PATH: str = f"{ABSOLUTE_PATH}/bench"
+SWAPI: str = "https://swapi.dev/api"
 
 __mkdirs(LOGGER_PATH)
@@ -0,0 +1,235 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["Store", "crawl", "load_store", "crawl_main"]
+
+import json
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Set
+
+from src.args import args
+from src.const import *
+from src.fetch import get_json
+from src.file_handler import *
+from src.functions import *
+from src.logger import *
+from src.routes import resource_id, resource_key
+
+Store = Dict[str, Dict[int, Any]]
+"""
+The local copy of SWAPI: every record by resource type and ID.
+"""
+
+CHECKPOINT_VERSION: int = 1
+
+
+def __links(value: Any) -> Iterator[str]:
+    """
+    The function `__links` yields every resource URL found in a record, nested lists included.
+    """
+    if isinstance(value, str):
+        if value.startswith(("http://", "https://")) and resource_id(value) is not None:
+            yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from __links(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from __links(item)
+
+
+def __files(path: str) -> Dict[str, str]:
+    return {
+        "records": f"{path}/records.jsonl",
+        "checkpoint": f"{path}/checkpoint.json",
+    }
+
+
+def __write_checkpoint(path: str, pending: Dict[str, str], done: Set[str]) -> None:
+    """
+    The function `__write_checkpoint` replaces the checkpoint atomically, so an interruption while it
+    is written leaves the previous one intact.
+    """
+    checkpoint: str = __files(path)["checkpoint"]
+    write_file(
+        f"{checkpoint}.tmp",
+        json.dumps(
+            {
+                "version": CHECKPOINT_VERSION,
+                "done": sorted(done),
+                "pending": sorted(pending.values()),
+            }
+        ),
+    )
+    os.replace(f"{checkpoint}.tmp", checkpoint)
+
+
+def crawl(path: str, workers: int = 8, checkpoint_every: int = 50) -> int:
+    """
+    The function `crawl` copies the whole SWAPI graph into the store at `path`. It starts at the API
+    root, follows every list page and every cross-link through a deduplicated frontier, with at most
+    `workers` requests in flight. The records are appended to `records.jsonl` and the frontier is
+    checkpointed to `checkpoint.json`, so an interrupted crawl resumes where it stopped.
+
+    @param path The `path` parameter is the directory of the store. It is created if needed.
+    @param workers The `workers` parameter is the number of concurrent requests.
+    @param checkpoint_every The `checkpoint_every` parameter is the number of fetched URLs between two
+    checkpoints.
+
+    @return The function `crawl` returns the number of URLs fetched by this call.
+    """
+    logger_specials.was_called(__name__, crawl.__name__)
+    create_directory(path)
+    files: Dict[str, str] = __files(path)
+    pending: Dict[str, str] = {}
+    done: Set[str] = set()
+
+    saved: str = (
+        load_file(files["checkpoint"])["content"]
+        if os.path.exists(files["checkpoint"])
+        else ""
+    )
+    if saved and json.loads(saved).get("version") == CHECKPOINT_VERSION:
+        checkpoint: Any = json.loads(saved)
+        done = set(checkpoint["done"])
+        pending = {resource_key(url): url for url in checkpoint["pending"]}
+        logger.info(f"Crawl resumed: {len(done)} done, {len(pending)} pending.")
+    else:
+        write_file(files["records"], "")
+        pending = {"root": f"{SWAPI}/"}
+
+    lines: List[str] = []
+
+    def discover(url: str) -> None:
+        key: str = resource_key(url)
+        if key not in done and key not in pending:
+            pending[key] = url
+
+    def store(record: Any) -> None:
+        key: str = resource_key(record.get("url", ""))
+        if resource_id(record.get("url")) is None or key in done:
+            return
+        done.add(key)
+        pending.pop(key, None)
+        lines.append(json.dumps({"key": key, "data": record}, separators=(",", ":")))
+        for link in __links(record):
+            discover(link)
+
+    def visit(key: str, url: str, data: Any) -> None:
+        if key == "root":
+            for link in data.values():
+                discover(link)
+        elif isinstance(data, dict) and "results" in data:
+            for record in data["results"]:
+                store(record)
+            if data.get("next"):
+                discover(data["next"])
+            if "?" not in key and data["results"]:
+                # The first page gives the page count, so the other pages are fetched concurrently.
+                pages: int = math.ceil(data.get("count", 0) / len(data["results"]))
+                for page in range(2, pages + 1):
+                    discover(f"{url.split('?')[0]}?page={page}")
+        else:
+            store(data)
+        done.add(key)
+
+    def flush() -> None:
+        if lines:
+            write_file(files["records"], "\n".join(lines) + "\n", "a")
+            lines.clear()
+        __write_checkpoint(path, pending, done)
+
+    fetched: int = 0
+    in_flight: Dict["Future[Any]", str] = {}
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="crawl"
+    ) as executor:
+        while pending or in_flight:
+            # List pages come first: most resources arrive with them, so a resource is fetched on
+            # its own only when no page listed it.
+            pages: List[str] = [key for key in pending if "/" not in key]
+            ready: List[str] = pages or (
+                []
+                if any("/" not in key for key in in_flight.values())
+                else list(pending)
+            )
+            for key in ready:
+                if len(in_flight) >= workers:
+                    break
+                if key not in in_flight.values():
+                    in_flight[executor.submit(get_json, pending[key])] = key
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = in_flight.pop(future)
+                # Results are applied by this thread only, so the frontier needs no lock.
+                visit(key, pending[key], future.result())
+                pending.pop(key, None)
+                fetched += 1
+                if fetched % checkpoint_every == 0:
+                    flush()
+                    logger.info(
+                        f"Crawl checkpoint: {len(done)} done, {len(pending)} pending."
+                    )
+    flush()
+    logger.info(f"Crawl finished: {fetched} URLs fetched, {len(done)} done.")
+    return fetched
+
+
+def load_store(path: str) -> Store:
+    """
+    The function `load_store` loads the store written by `crawl` in one pass.
+
+    @param path The `path` parameter is the directory of the store.
+
+    @return The function `load_store` returns every record by resource type and ID. A record that
+    was written twice (after a resumed crawl) is kept once.
+
+    @raise ValueError If `path` holds no store, an empty one, or one whose crawl was interrupted
+    (its checkpoint still has pending URLs).
+    """
+    logger_specials.was_called(__name__, load_store.__name__)
+    files: Dict[str, str] = __files(path)
+    if not os.path.exists(files["records"]):
+        raise ValueError(f"'{path}' is not a store: run '-crawl {path}' first.")
+    if os.path.exists(files["checkpoint"]):
+        pending: List[str] = json.loads(load_file(files["checkpoint"])["content"]).get(
+            "pending", []
+        )
+        if pending:
+            raise ValueError(
+                f"The store '{path}' is incomplete ({len(pending)} URLs pending): "
+                f"run '-crawl {path}' again to finish it."
+            )
+    store: Store = {}
+    content: str = load_file(files["records"])["content"]
+    for line in content.splitlines():
+        if line:
+            entry: Any = json.loads(line)
+            resource, index = entry["key"].split("/")
+            store.setdefault(resource, {})[int(index)] = entry["data"]
+    if not store:
+        raise ValueError(
+            f"The store '{path}' has no records: run '-crawl {path}' again."
+        )
+    logger.info(
+        f"Store loaded: { {resource: len(rows) for resource, rows in store.items()} }"
+    )
+    return store
+
+
+def crawl_main() -> int:
+    """
+    The function `crawl_main` crawls SWAPI into the store given through `-crawl`.
+    """
+    logger_specials.was_called(__name__, crawl_main.__name__)
+    fetched: int = crawl(args.crawl, workers=args.crawlWorkers)
+    prt(f"Crawl finished: {fetched} URLs fetched into '{args.crawl}'.")
+    return 0
@@ -0,0 +1,144 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["Entity", "refs"]
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.fetch import get_json
+from src.logger import *
+from src.routes import parse_route
+
+
+def _parse_url(url: str) -> Tuple[str, int]:
+    """
+    The function `_parse_url` returns the resource type and the ID of a SWAPI resource URL, such as
+    `("people", 13)` for `https://swapi.dev/api/people/13/`.
+    """
+    kind, index = parse_route(url)
+    if index is None:
+        raise ValueError(f"'{url}' is not a SWAPI resource URL.")
+    return kind, index
+
+
+class _Siblings:
+    def __init__(self, workers: int) -> None:
+        """
+        The function initializes a group of entities that are fetched together.
+
+        @param workers The `workers` parameter is the number of requests sent at the same time.
+        """
+        self.entities: List["Entity"] = []
+        self.workers: int = workers
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        The function `load` fetches every entity of the group that is not loaded yet, concurrently.
+        """
+        with self.lock:
+            pending: List["Entity"] = [
+                entity for entity in self.entities if not entity.loaded
+            ]
+            if not pending:
+                return
+            logger_specials.from_specific(
+                __name__, "_Siblings.load", message=f"batch fetch of {len(pending)}."
+            )
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for entity, data in zip(
+                    pending, executor.map(get_json, [entity.url for entity in pending])
+                ):
+                    entity._set(data)
+
+
+class Entity:
+    __slots__ = ("url", "kind", "id", "_data", "_siblings")
+
+    def __init__(self, url: str, siblings: _Siblings | None = None) -> None:
+        """
+        The function initializes a lazy reference to a SWAPI resource. Its URL, resource type and ID
+        are known without any request; the record is fetched on the first access to another field.
+
+        @param url The `url` parameter is the URL of the resource.
+        @param siblings The `siblings` parameter is the group the entity is fetched with. Entities
+        created by `refs` share one, so reading a field of one fetches all of them at once.
+        """
+        self.url: str = url
+        self.kind, self.id = _parse_url(url)
+        self._data: Dict[str, Any] | None = None
+        self._siblings: _Siblings | None = siblings
+
+    @property
+    def loaded(self) -> bool:
+        """
+        The property `loaded` tells whether the record was fetched already.
+        """
+        return self._data is not None
+
+    def _set(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def fetch(self) -> Dict[str, Any]:
+        """
+        The function `fetch` returns the record, fetching it (with its siblings) if needed.
+        """
+        if self._data is None:
+            if self._siblings is not None:
+                self._siblings.load()
+            else:
+                self._set(get_json(self.url))
+        return self._data  # type: ignore[return-value]
+
+    def __getitem__(self, field: str) -> Any:
+        if field == "url":
+            return self.url
+        return self.fetch()[field]
+
+    def __getattr__(self, field: str) -> Any:
+        # Only called for names that are not slots, so `url`, `kind` and `id` never fetch.
+        if field.startswith("_"):
+            raise AttributeError(field)
+        try:
+            return self.fetch()[field]
+        except KeyError:
+            raise AttributeError(field) from None
+
+    def get(self, field: str, default: Any = None) -> Any:
+        return self[field] if field == "url" else self.fetch().get(field, default)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Entity):
+            return NotImplemented
+        return (self.kind, self.id) == (other.kind, other.id)
+
+    def __hash__(self) -> int:
+        return hash((self.kind, self.id))
+
+    def __repr__(self) -> str:
+        return f"Entity({self.kind}/{self.id}{'' if self.loaded else ', lazy'})"
+
+
+def refs(urls: Iterable[str], workers: int = 8) -> List[Entity]:
+    """
+    The function `refs` turns a list of resource URLs, such as the `people` of a species, into lazy
+    entities that are fetched together the first time any of them is read. Counting them or comparing
+    them needs no request at all.
+
+    @param urls The `urls` parameter is the list of resource URLs.
+    @param workers The `workers` parameter is the number of requests sent at the same time when the
+    group is fetched.
+
+    @return The function `refs` returns one `Entity` per URL, in the same order.
+    """
+    siblings: _Siblings = _Siblings(workers)
+    siblings.entities = [Entity(url, siblings) for url in urls]
+    return siblings.entities
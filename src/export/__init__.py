@@ -0,0 +1,314 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["EXPORT_FORMATS", "COLUMNS", "export_records", "export_main"]
+
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from src.args import args
+from src.const import *
+from src.fetch import get_json
+from src.file_handler import *
+from src.functions import *
+from src.logger import *
+from src.routes import resource_id
+
+EXPORT_FORMATS: Tuple[str, ...] = ("arrow", "parquet")
+"""
+The file formats of `-export`: Arrow IPC (`.arrow`, memory-mappable) and Parquet (`.parquet`).
+"""
+
+__COMMON: List[Tuple[str, str]] = [
+    ("id", "int"),
+    ("created", "timestamp"),
+    ("edited", "timestamp"),
+    ("url", "str"),
+]
+__CRAFT: List[Tuple[str, str]] = [
+    ("name", "str"),
+    ("model", "str"),
+    ("manufacturer", "str"),
+    ("cost_in_credits", "float"),
+    ("length", "float"),
+    ("max_atmosphering_speed", "float"),
+    ("crew", "str"),
+    ("passengers", "str"),
+    ("cargo_capacity", "float"),
+    ("consumables", "str"),
+    ("pilots", "refs"),
+    ("films", "refs"),
+]
+
+__RESOURCE_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    "films": [
+        ("title", "str"),
+        ("episode_id", "int"),
+        ("opening_crawl", "str"),
+        ("director", "str"),
+        ("producer", "str"),
+        ("release_date", "date"),
+        ("characters", "refs"),
+        ("planets", "refs"),
+        ("starships", "refs"),
+        ("vehicles", "refs"),
+        ("species", "refs"),
+    ],
+    "people": [
+        ("name", "str"),
+        ("height", "float"),
+        ("mass", "float"),
+        ("hair_color", "str"),
+        ("skin_color", "str"),
+        ("eye_color", "str"),
+        ("birth_year", "str"),
+        ("gender", "str"),
+        ("homeworld", "ref"),
+        ("films", "refs"),
+        ("species", "refs"),
+        ("vehicles", "refs"),
+        ("starships", "refs"),
+    ],
+    "planets": [
+        ("name", "str"),
+        ("rotation_period", "float"),
+        ("orbital_period", "float"),
+        ("diameter", "float"),
+        ("climate", "str"),
+        ("gravity", "str"),
+        ("terrain", "str"),
+        ("surface_water", "float"),
+        ("population", "float"),
+        ("residents", "refs"),
+        ("films", "refs"),
+    ],
+    "species": [
+        ("name", "str"),
+        ("classification", "str"),
+        ("designation", "str"),
+        ("average_height", "float"),
+        ("skin_colors", "str"),
+        ("hair_colors", "str"),
+        ("eye_colors", "str"),
+        ("average_lifespan", "float"),
+        ("homeworld", "ref"),
+        ("language", "str"),
+        ("people", "refs"),
+        ("films", "refs"),
+    ],
+    "starships": __CRAFT
+    + [("hyperdrive_rating", "float"), ("MGLT", "float"), ("starship_class", "str")],
+    "vehicles": __CRAFT + [("vehicle_class", "str")],
+}
+
+COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    resource: __COMMON + columns for resource, columns in __RESOURCE_COLUMNS.items()
+}
+"""
+The typed columns of every resource type, after the common `id`, `created`, `edited` and `url`.
+SWAPI sends every value as a string: numbers lose their thousands separators and become null when
+"unknown" or "n/a", and relationships (`ref`, `refs`) become the IDs of the linked resources.
+"""
+
+
+def __number(value: Any, kind: Callable[[str], Any]) -> Any:
+    try:
+        return kind(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def __moment(value: Any) -> datetime | None:
+    try:
+        # Python 3.10 does not parse the trailing "Z" of SWAPI timestamps.
+        text: str = str(value)
+        return datetime.fromisoformat(
+            text[:-1] + "+00:00" if text.endswith("Z") else text
+        )
+    except ValueError:
+        return None
+
+
+def __day(value: Any) -> date | None:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "str": lambda value: None if value is None else str(value),
+    "int": lambda value: __number(value, int),
+    "float": lambda value: __number(value, float),
+    "timestamp": __moment,
+    "date": __day,
+    "ref": resource_id,
+    "refs": lambda value: [resource_id(url) for url in value or []],
+}
+
+
+def _arrow_schema(pa: Any, resource: str) -> Any:
+    types: Dict[str, Any] = {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "date": pa.date32(),
+        "ref": pa.int64(),
+        "refs": pa.list_(pa.int64()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS[resource]])
+
+
+class _Writer:
+    def __init__(
+        self, pa: Any, resource: str, path: str, fmt: str, batch_size: int
+    ) -> None:
+        """
+        The function initializes the file of one resource type. Rows are buffered column by column
+        and written as a record batch every `batch_size` rows, so memory does not grow with the
+        number of records.
+        """
+        self.resource: str = resource
+        self.schema: Any = _arrow_schema(pa, resource)
+        self.batch_size: int = batch_size
+        self.columns: Dict[str, List[Any]] = {name: [] for name, _ in COLUMNS[resource]}
+        self.rows: int = 0
+        self.__pa: Any = pa
+        self.file_name: str = f"{path}/{resource}.{fmt}"
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self.__sink: Any = pq.ParquetWriter(self.file_name, self.schema)
+        else:
+            self.__sink = pa.ipc.new_file(self.file_name, self.schema)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        record = {**record, "id": resource_id(record.get("url"))}
+        for name, kind in COLUMNS[self.resource]:
+            self.columns[name].append(_CONVERTERS[kind](record.get(name)))
+        self.rows += 1
+        if len(self.columns["id"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.columns["id"]:
+            return
+        self.__sink.write_batch(
+            self.__pa.record_batch(
+                [self.columns[field.name] for field in self.schema], schema=self.schema
+            )
+        )
+        for values in self.columns.values():
+            values.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.__sink.close()
+        logger.info(
+            f"Export {self.resource}: {self.rows} rows written to '{self.file_name}'."
+        )
+
+
+def export_records(
+    records: Iterable[Tuple[str, Dict[str, Any]]],
+    path: str,
+    fmt: str = "arrow",
+    batch_size: int = 1024,
+) -> Dict[str, int]:
+    """
+    The function `export_records` writes SWAPI records as one typed file per resource type, with the
+    columns of `COLUMNS`. It needs the optional `pyarrow` package.
+
+    @param records The `records` parameter is an iterable of `(resource, record)` pairs, in any order.
+    A record seen twice (same resource and ID) is written once.
+    @param path The `path` parameter is the output directory. It is created if needed.
+    @param fmt The `fmt` parameter is one of `EXPORT_FORMATS`.
+    @param batch_size The `batch_size` parameter is the number of rows per record batch (or Parquet
+    row group).
+
+    @return The function `export_records` returns the number of rows written per resource type.
+
+    @raise ImportError If `pyarrow` is not installed.
+    """
+    logger_specials.was_called(__name__, export_records.__name__)
+    import pyarrow as pa
+
+    create_directory(path)
+    writers: Dict[str, _Writer] = {}
+    seen: Dict[str, Set[int | None]] = {}
+    try:
+        for resource, record in records:
+            if resource not in COLUMNS:
+                continue
+            index: int | None = resource_id(record.get("url"))
+            if index in seen.setdefault(resource, set()):
+                continue
+            seen[resource].add(index)
+            if resource not in writers:
+                writers[resource] = _Writer(pa, resource, path, fmt, batch_size)
+            writers[resource].append(record)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return {resource: writer.rows for resource, writer in writers.items()}
+
+
+def __store_records(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    The function `__store_records` streams the records of a store written by `-crawl`, line by line.
+    """
+    with open(f"{path}/records.jsonl") as file_object:
+        for line in file_object:
+            if line.strip():
+                entry: Any = json.loads(line)
+                yield entry["key"].split("/")[0], entry["data"]
+
+
+def __api_records() -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    The function `__api_records` streams the records of every resource type listed by the API root,
+    page by page.
+    """
+    for resource, route in get_json(f"{SWAPI}/").items():
+        while route and resource in COLUMNS:
+            page: Any = get_json(route)
+            for record in page["results"]:
+                yield resource, record
+            route = page.get("next")
+
+
+def export_main() -> int:
+    """
+    The function `export_main` exports the store given through `-store` (or, without it, the API) to
+    the directory given through `-export`, in the format of `-exportFormat`.
+
+    @return The function `export_main` returns 0 once the files are written, 1 if `pyarrow` is missing.
+    """
+    logger_specials.was_called(__name__, export_main.__name__)
+    records: Iterator[Tuple[str, Dict[str, Any]]] = (
+        __store_records(args.store)
+        if args.store and os.path.exists(f"{args.store}/records.jsonl")
+        else __api_records()
+    )
+    try:
+        rows: Dict[str, int] = export_records(records, args.export, args.exportFormat)
+    except ImportError:
+        logger.error(
+            "The export needs the optional 'pyarrow' package: pip install pyarrow"
+        )
+        prt("The export needs the optional 'pyarrow' package: pip install pyarrow")
+        return 1
+    for resource, count in rows.items():
+        prt(
+            f"{resource}: {count} rows written to '{args.export}/{resource}.{args.exportFormat}'."
+        )
+    return 0
@@ -0,0 +1,317 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = [
+    "ResponseType",
+    "SEARCH_FIELDS",
+    "get_request",
+    "get_json",
+    "get_all",
+    "get_where",
+    "Transport",
+    "use_transport",
+    "make_response",
+    "clear_cache",
+]
+
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import quote
+
+import requests
+
+from src.args import args
+from src.const import *
+from src.hedge import Hedger
+from src.logger import *
+from src.metrics import metrics
+from src.mirrors import MirrorPool
+
+ResponseType = requests.Response
+"""
+The type of the responses returned by `get_request`: instances of `requests.Response`.
+"""
+
+SEARCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "films": ("title",),
+    "people": ("name",),
+    "planets": ("name",),
+    "species": ("name",),
+    "starships": ("name", "model"),
+    "vehicles": ("name", "model"),
+}
+"""
+The fields SWAPI's `?search=` parameter matches (case-insensitive substring) per resource type.
+"""
+
+__predicates: Dict[str, Callable[[Any, str], bool]] = {
+    "eq": lambda field, value: field == value,
+    "contains": lambda field, value: isinstance(field, str) and value in field,
+}
+
+Transport = Callable[[str, bool], Any]
+"""
+A function that sends a GET request for a route (and the `verify` flag) and returns the response.
+"""
+
+__responses: Dict[str, requests.Response] = {}
+__transport: Transport = lambda route, verify: requests.get(
+    route, verify=verify, timeout=args.timeout or None
+)
+__default_transport: Transport = __transport
+__hedger: Hedger | None = (
+    Hedger(
+        percentile=args.hedgePercentile,
+        budget=args.hedgeBudget,
+        burst=args.hedgeBurst,
+        min_samples=args.hedgeMinSamples,
+        initial_delay=args.hedgeDelay or None,
+    )
+    if args.hedge
+    else None
+)
+__mirrors: MirrorPool | None = (
+    MirrorPool(
+        [base.strip() for base in args.mirrors.split(",") if base.strip()],
+        aliases=[SWAPI],
+        cooldown=args.mirrorCooldown,
+    )
+    if args.mirrors
+    else None
+)
+
+
+def use_transport(transport: Transport | None = None) -> Transport:
+    """
+    The function `use_transport` replaces the function `get_request` sends its requests through, for
+    example to serve recorded fixtures instead of the network.
+
+    @param transport The `transport` parameter is the new transport. `None` restores the default
+    one, which uses `requests.get`.
+
+    @return The function `use_transport` returns the previous transport, so callers can restore it.
+    """
+    global __transport
+    previous: Transport = __transport
+    __transport = transport if transport is not None else __default_transport
+    logger_specials.value_was_set("fetch.transport", __transport, use_transport)
+    return previous
+
+
+def make_response(route: str, content: bytes, status: int = 200) -> Any:
+    """
+    The function `make_response` builds a `requests.Response` for transports that do not use the
+    network.
+
+    @param route The `route` parameter is the URL the response belongs to.
+    @param content The `content` parameter is the raw response body.
+    @param status The `status` parameter is the HTTP status code.
+
+    @return The function `make_response` returns the response object.
+    """
+    response: Any = requests.Response()
+    response.url = route
+    response.status_code = status
+    response._content = content
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def clear_cache() -> None:
+    """
+    The function `clear_cache` forgets every response kept by `get_request` during the run.
+    """
+    __responses.clear()
+
+
+def __hedge_route(route: str) -> str:
+    """
+    The function `__hedge_route` returns the URL a hedge of `route` is sent to: the same route on the
+    second best mirror when `-mirrors` was given, on the `-hedgeMirror` base URL if one was given,
+    otherwise the route itself.
+    """
+    if __mirrors is not None:
+        return __mirrors.alternate(route)
+    if args.hedgeMirror and route.startswith(SWAPI):
+        return args.hedgeMirror.rstrip("/") + route[len(SWAPI) :]
+    return route
+
+
+def __attempt(url: str, verify: bool) -> Any:
+    """
+    The function `__attempt` sends one request through the transport. When `-mirrors` was given, it
+    records the latency and health of the mirror `url` points to, and points the cross-resource
+    URLs of the response to that mirror. A hedge is an attempt of its own, so a stalled mirror is
+    charged its own latency or timeout even when another mirror answered first.
+    """
+    if __mirrors is None:
+        return __transport(url, verify)
+
+    base: str = __mirrors.split(url)[0]
+    start: float = time.perf_counter()
+    try:
+        response: Any = __transport(url, verify)
+    except (requests.ConnectionError, requests.Timeout):
+        # A refused connection is fast; it must not make the mirror look fast.
+        __mirrors.observe(
+            base, max(time.perf_counter() - start, args.timeout or 30.0), False
+        )
+        raise
+    __mirrors.observe(base, time.perf_counter() - start, response.status_code < 500)
+    metrics.increment("mirror_requests_total", mirror=base)
+    response._content = __mirrors.rewrite_payload(response.content, base)
+    return response
+
+
+def __send(route: str, verify: bool) -> Any:
+    """
+    The function `__send` sends a request to the best mirror when `-mirrors` was given, hedged when
+    `-hedge` was given.
+    """
+    url: str = (
+        route if __mirrors is None else __mirrors.rewrite(route, __mirrors.choose())
+    )
+    if __hedger is None:
+        return __attempt(url, verify)
+    return __hedger.send(lambda hedge: __attempt(hedge, verify), url, __hedge_route)
+
+
+def __cache_key(route: str) -> str:
+    """
+    The function `__cache_key` returns the key a response is cached under: the route without its
+    mirror base URL when `-mirrors` was given, so a resource is fetched once whichever mirror it
+    is linked from.
+    """
+    return route if __mirrors is None else __mirrors.split(route)[1]
+
+
+def get_request(
+    route: str, verify: bool = False, retries: int = 2
+) -> requests.Response:
+    """
+    The function `get_request` performs an HTTP GET request to the specified `route`, with an optional
+    `verify` parameter to enable/disable SSL certificate verification. Successful responses are kept
+    for the rest of the run, and every request is recorded in `metrics` (latency, bytes, status,
+    cache hits and retries).
+
+    @param route The `route` parameter is a string specifying the URL to which the GET request will be
+    sent.
+    @param verify The `verify` parameter is a boolean flag that determines whether SSL certificate
+    verification should be performed. It defaults to `False` if not explicitly specified.
+    @param retries The `retries` parameter is the number of times a request that failed to connect
+    or timed out is sent again. It defaults to `2`.
+
+    @return The function `get_request` returns a `Response` object containing the server's response
+    to the HTTP GET request.
+    """
+    key: str = __cache_key(route)
+    if key in __responses:
+        metrics.record_cache_hit(route)
+        return __responses[key]
+
+    start: float = time.perf_counter()
+    attempt: int = 0
+    while True:
+        try:
+            response: Any = __send(route, verify)
+            break
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                metrics.record_request(
+                    route, time.perf_counter() - start, 0, 0, attempt
+                )
+                raise
+            attempt += 1
+            logger.warning(
+                f"Request to {route} failed, retrying ({attempt}/{retries})."
+            )
+
+    metrics.record_request(
+        route,
+        time.perf_counter() - start,
+        len(response.content),
+        response.status_code,
+        attempt,
+    )
+    if response.ok:
+        __responses[key] = response
+    return response
+
+
+def get_json(route: str) -> Any:
+    """
+    The function `get_json` returns the decoded JSON body of a GET request to `route`.
+    """
+    return get_request(route).json()
+
+
+def __get_pages(route: str) -> List[Any]:
+    """
+    The function `__get_pages` follows the `next` links of a paginated SWAPI list, starting at `route`,
+    and returns the `results` of every page.
+    """
+    rows: List[Any] = []
+    page: Any = route
+    while page:
+        data: Any = get_json(page)
+        rows.extend(data.get("results", []))
+        page = data.get("next")
+    return rows
+
+
+def get_all(resource: str) -> List[Any]:
+    """
+    The function `get_all` downloads every page of the list of a resource type.
+
+    @param resource The `resource` parameter is the SWAPI resource type, for example "planets".
+
+    @return The function `get_all` returns the records of every page.
+    """
+    logger_specials.from_specific(__name__, get_all.__name__, resource)
+    return __get_pages(f"{SWAPI}/{resource}/")
+
+
+def get_where(resource: str, field: str, value: str, op: str = "eq") -> List[Any]:
+    """
+    The function `get_where` returns the records of a resource type whose `field` matches `value`.
+    When SWAPI can search on `field`, the predicate is pushed down as a `?search=` request and only the
+    matching pages are downloaded; otherwise the whole list is downloaded. Either way every row is
+    rechecked exactly on the client, because SWAPI's search is a case-insensitive substring match.
+
+    @param resource The `resource` parameter is the SWAPI resource type, for example "species".
+    @param field The `field` parameter is the record field the predicate applies to.
+    @param value The `value` parameter is the value the field is compared with.
+    @param op The `op` parameter is the predicate: "eq" for equality, "contains" for a (case
+    sensitive) substring match.
+
+    @return The function `get_where` returns the matching records.
+    """
+    if op not in __predicates:
+        raise ValueError(
+            f"Unsupported predicate '{op}', expected one of {list(__predicates)}."
+        )
+
+    rows: List[Any] = []
+    if field in SEARCH_FIELDS.get(resource, ()):
+        logger_specials.from_specific(
+            __name__, get_where.__name__, (resource, field, value, op), "pushed down."
+        )
+        metrics.increment("pushdowns_total", endpoint=resource)
+        rows = __get_pages(f"{SWAPI}/{resource}/?search={quote(value)}")
+    else:
+        logger_specials.from_specific(
+            __name__,
+            get_where.__name__,
+            (resource, field, value, op),
+            "filtered locally.",
+        )
+        rows = get_all(resource)
+
+    predicate: Callable[[Any, str], bool] = __predicates[op]
+    return [row for row in rows if predicate(row.get(field), value)]
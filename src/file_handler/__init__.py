@@ -9,6 +9,7 @@ Copyright (c) 2024 zperk
 
 __all__ = [
     "load_file",
+    "write_file",
     "create_directory",
     "create_file",
     "delete_folder",
@@ -81,6 +82,39 @@ def load_file(absolute: str, mode: str = "r") -> Dict[str, Any]:
         return __set_return_type(is_error=True)
 
 
+def write_file(absolute: str, content: Any, mode: str = "w") -> Dict[str, Any]:
+    """
+    The function `write_file` opens a file and writes the given content to it, returning a dictionary
+    containing the file object and the written content, with error handling for missing directories and
+    unexpected errors.
+
+    @param absolute The `absolute` parameter in the `write_file` function refers to the name or path of
+    the file that you want to write to.
+    @param content The `content` parameter in the `write_file` function is the string (or bytes, for
+    binary modes) that will be written to the file.
+    @param mode The `mode` parameter in the `write_file` function specifies the mode in which the file
+    should be opened. It defaults to "w"; use "a" to append to an existing file.
+
+    @return The function `write_file` returns a dictionary with keys 'object' and 'content' containing
+    the file object opened in the specified mode and the written content, respectively. If the file
+    cannot be written, the content is an empty string.
+    """
+    try:
+        with open(absolute, mode) as file_object:
+            file_object.write(content)
+        logger.debug(f"File: {absolute} was written.")
+        return __set_return_type(file_object, content)
+    except FileNotFoundError:
+        logger.error(f"Directory of file '{absolute}' not found.")
+        return __set_return_type(is_error=True)
+    except Exception:
+        logger_specials.unexpected_error(
+            error_type="writing file",
+            item=absolute,
+        )
+        return __set_return_type(is_error=True)
+
+
 def create_directory(*args: str) -> None:
     """
     The function `create_directory` creates a directory if it does not already exist.
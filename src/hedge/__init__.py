@@ -0,0 +1,173 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["Hedger"]
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, List, Set
+
+from src.logger import *
+from src.metrics import endpoint_type, metrics
+
+
+def _close_response(future: "Future[Any]") -> None:
+    """
+    The function `_close_response` releases the connection of a request that lost its race.
+    """
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _attempt(send: Callable[[str], Any], route: str) -> "Future[Any]":
+    """
+    The function `_attempt` sends one request on its own daemon thread and returns its future. A
+    request that loses its race keeps running until it finishes or times out, and a daemon thread
+    does not keep the process alive for it at exit, as a pool thread would.
+    """
+    future: "Future[Any]" = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(send(route))
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=run, name="hedge", daemon=True).start()
+    return future
+
+
+class Hedger:
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        burst: int = 2,
+        min_samples: int = 20,
+        window: int = 200,
+        initial_delay: float | None = None,
+    ) -> None:
+        """
+        The function initializes a request hedger: a request still running after the `percentile`
+        latency of its endpoint type is duplicated, and the first answer wins.
+
+        @param percentile The `percentile` parameter is the latency percentile, over the recent
+        requests of the same endpoint type, after which a hedge is sent.
+        @param budget The `budget` parameter caps the hedges to this fraction of the requests sent.
+        @param burst The `burst` parameter is the number of hedges allowed on top of the budget, so
+        the first requests of a run can be hedged before the budget has grown.
+        @param min_samples The `min_samples` parameter is the number of latencies an endpoint type
+        needs before its percentile is used.
+        @param window The `window` parameter is the number of recent latencies kept per endpoint type.
+        @param initial_delay The `initial_delay` parameter is the hedge delay, in seconds, of an
+        endpoint type with fewer than `min_samples` latencies. `None` does not hedge it at all. A
+        short run sends only a few requests per endpoint type, so without it nothing is hedged.
+        """
+        self.percentile: float = percentile
+        self.budget: float = budget
+        self.burst: int = burst
+        self.min_samples: int = min_samples
+        self.initial_delay: float | None = initial_delay
+        self.__window: int = window
+        self.__latencies: Dict[str, Deque[float]] = {}
+        self.__lock = threading.Lock()
+        self.sent: int = 0
+        self.fired: int = 0
+
+    def delay(self, endpoint: str) -> float | None:
+        """
+        The function `delay` returns the time after which a request of `endpoint` is hedged: the
+        tracked percentile, or `initial_delay` while fewer than `min_samples` latencies were observed.
+        `None` means the request is not hedged.
+        """
+        with self.__lock:
+            latencies: Deque[float] = self.__latencies.get(endpoint, deque())
+            if len(latencies) < self.min_samples:
+                return self.initial_delay
+            ordered: List[float] = sorted(latencies)
+        rank: int = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+        return ordered[rank]
+
+    def __observe(self, endpoint: str, seconds: float) -> None:
+        with self.__lock:
+            latencies: Deque[float] = self.__latencies.setdefault(
+                endpoint, deque(maxlen=self.__window)
+            )
+            latencies.append(seconds)
+
+    def __within_budget(self) -> bool:
+        with self.__lock:
+            if self.fired >= self.burst + self.budget * self.sent:
+                return False
+            self.fired += 1
+            return True
+
+    def send(
+        self,
+        send: Callable[[str], Any],
+        route: str,
+        alternate: Callable[[str], str] = lambda route: route,
+    ) -> Any:
+        """
+        The function `send` sends `route` and, if it is still running after the tracked percentile
+        latency and the budget allows it, sends a duplicate to `alternate(route)`. Whichever answers
+        first is returned; the other one is closed when it finishes, and never delays the exit of the
+        process.
+
+        @param send The `send` parameter is the function that performs a request for a URL.
+        @param route The `route` parameter is the requested URL.
+        @param alternate The `alternate` parameter returns the URL the hedge is sent to, for example
+        the same route on a mirror. It defaults to the route itself.
+
+        @return The function `send` returns the response of the request that answered first. If both
+        fail, the error of the primary request is raised.
+        """
+        endpoint: str = endpoint_type(route)
+        start: float = time.perf_counter()
+        with self.__lock:
+            self.sent += 1
+        primary: "Future[Any]" = _attempt(send, route)
+        delay: float | None = self.delay(endpoint)
+        if delay is None or not wait([primary], timeout=delay).not_done:
+            response: Any = primary.result()
+            self.__observe(endpoint, time.perf_counter() - start)
+            return response
+        if not self.__within_budget():
+            metrics.increment("hedges_skipped_total", endpoint=endpoint)
+            response = primary.result()
+            self.__observe(endpoint, time.perf_counter() - start)
+            return response
+
+        hedge_route: str = alternate(route)
+        logger.debug(f"Hedging {route} after {delay:.3f} s to {hedge_route}.")
+        metrics.increment("hedges_fired_total", endpoint=endpoint)
+        hedge: "Future[Any]" = _attempt(send, hedge_route)
+        pending: Set["Future[Any]"] = {primary, hedge}
+        winner: "Future[Any]" = primary
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            successful: List["Future[Any]"] = [
+                future for future in done if future.exception() is None
+            ]
+            if successful:
+                winner = primary if primary in successful else successful[0]
+                break
+
+        for future in (primary, hedge):
+            if future is not winner:
+                future.add_done_callback(_close_response)
+        if winner is hedge:
+            metrics.increment("hedges_won_total", endpoint=endpoint)
+        self.__observe(endpoint, time.perf_counter() - start)
+        # Both requests failed: the primary's error is the meaningful one.
+        return winner.result()
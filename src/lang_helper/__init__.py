@@ -1,11 +1,10 @@
-__all__ = ["lang", "lang_values"]
+__all__ = ["lang", "lang_values", "render_answers"]
 
-import argparse
-from argparse import (
-    Namespace,
-)
-from typing import Callable, Dict
+import re
+from argparse import Namespace
+from typing import Any, Callable, Dict
 
+from src.args import args
 from src.file_handler import *
 from src.const import *
 
@@ -20,30 +19,28 @@ def __lang_file_handler(filename: str = "", force_ex: bool = False) -> str:
     return load_file(f"{LANG_PATH}/{filename}.txt")["content"]
 
 
-def __parse_args() -> Namespace:
-    parser = argparse.ArgumentParser(
-        prog="SWAPI-Explorer-API/main.py",
-    )
+def render_answers(
+    template: str, answers: Dict[int, Any], pending: str | None = None
+) -> str:
+    """
+    The function `render_answers` replaces the `<ans.N>` placeholders of a language template with the
+    given answers. Placeholders without an answer are left untouched, unless `pending` is given.
 
-    parser.add_argument(
-        "-EN",
-        default=False,
-        action="store_true",
-        help="(BOOLEAN) - Set the API output responses to English. (Default is False)",
-    )
+    @param template The `template` parameter is the text loaded from a language file.
+    @param answers The `answers` parameter maps the number `N` of each placeholder to its value.
+    @param pending The `pending` parameter replaces the placeholders that have no answer yet, to
+    render partial results.
 
-    parser.add_argument(
-        "-ES",
-        default=False,
-        action="store_true",
-        help="(BOOLEAN) - Establece las respuestas de salida de la API en español. "
-        "(El valor predeterminado es False)",
-    )
+    @return The function `render_answers` returns the rendered text.
+    """
+    for number, answer in answers.items():
+        template = template.replace(f"<ans.{number}>", str(answer))
+    if pending is not None:
+        template = re.sub(r"<ans\.\d+>", pending, template)
+    return template
 
-    return parser.parse_args()
 
-
-__args: Namespace = __parse_args()
+__args: Namespace = args
 
 lang: str = "null"
 lang_values: Dict[str, Callable[[], str]] = {
@@ -0,0 +1,198 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["DURATION_BUCKETS", "analyze_log_file", "analyze_logs", "analyze_logs_main"]
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Callable, Dict, Iterator, List, Tuple
+
+from src.args import args
+from src.const import *
+from src.file_handler import *
+from src.functions import *
+from src.logger import *
+from src.metrics import Histogram
+
+DURATION_BUCKETS: Tuple[float, ...] = tuple(
+    0.0001 * 2**power for power in range(28)
+) + (float("inf"),)
+"""
+The upper bounds, in seconds, of the operation duration histograms: powers of two from 0.1 ms to
+about 3.7 hours. The fixed buckets keep the memory constant however many lines are read.
+"""
+
+__OPENERS: Dict[str, Callable[[str], IO[str]]] = {
+    ".log": lambda name: open(name, "rt", errors="replace"),
+    ".gz": lambda name: gzip.open(name, "rt", errors="replace"),
+    ".bz2": lambda name: bz2.open(name, "rt", errors="replace"),
+    ".xz": lambda name: lzma.open(name, "rt", errors="replace"),
+}
+__LINE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}):\d{2}:\d{2} - (\w+) - (.*)$")
+__TIMING = re.compile(
+    r"^Operation: (.*?)(?: at 0x[0-9a-fA-F]+)?>?, took: ([0-9.eE+-]+) ms\.$"
+)
+__ERROR_LEVELS = ("ERROR", "CRITICAL")
+
+Partial = Dict[str, Any]
+
+
+def __log_files(path: str) -> Iterator[str]:
+    """
+    The function `__log_files` yields every log file under `path`, compressed ones included.
+    """
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if name.endswith(".log") or name.endswith(
+                tuple(f".log{suffix}" for suffix in (".gz", ".bz2", ".xz"))
+            ):
+                yield os.path.join(root, name)
+
+
+def analyze_log_file(file_name: str, period: int = 10) -> Partial:
+    """
+    The function `analyze_log_file` streams one log file line by line and returns its partial result:
+    a duration histogram per operation and, per period, the number of lines, error lines, runs and
+    failed runs. A log file is one run, counted in the period it started in; it failed if it has at
+    least one ERROR or CRITICAL line.
+
+    @param file_name The `file_name` parameter is the log file, optionally compressed with gzip, bzip2
+    or xz.
+    @param period The `period` parameter is the length of the timestamp prefix the trend is grouped
+    by: 10 groups by day, 13 by hour.
+
+    @return The function `analyze_log_file` returns the partial result, mergeable with others.
+    """
+    operations: Dict[str, Histogram] = {}
+    trend: Dict[str, List[int]] = {}
+    opener: Callable[[str], IO[str]] = __OPENERS[os.path.splitext(file_name)[1]]
+    first: str = ""
+    failed: bool = False
+    with opener(file_name) as file_object:
+        for line in file_object:
+            match: Any = __LINE.match(line.rstrip("\n"))
+            if match is None:
+                # Continuation of a multi-line message, such as a traceback.
+                continue
+            key: str = match.group(1).replace(" ", "T")[:period]
+            first = first or key
+            counts: List[int] = trend.setdefault(key, [0, 0, 0, 0])
+            counts[0] += 1
+            if match.group(2) in __ERROR_LEVELS:
+                counts[1] += 1
+                failed = True
+            timing: Any = __TIMING.match(match.group(3))
+            if timing is not None:
+                operations.setdefault(
+                    timing.group(1) + ">", Histogram(DURATION_BUCKETS)
+                ).observe(float(timing.group(2)))
+    if first:
+        trend[first][2] += 1
+        trend[first][3] += failed
+    return {"operations": operations, "trend": trend, "files": 1}
+
+
+def __merge(total: Partial, partial: Partial) -> Partial:
+    for operation, histogram in partial["operations"].items():
+        total["operations"].setdefault(operation, Histogram(DURATION_BUCKETS)).merge(
+            histogram
+        )
+    for key, counts in partial["trend"].items():
+        merged: List[int] = total["trend"].setdefault(key, [0, 0, 0, 0])
+        for index, count in enumerate(counts):
+            merged[index] += count
+    total["files"] += partial["files"]
+    return total
+
+
+def analyze_logs(
+    path: str = LOGGER_PATH, workers: int = 0, by_hour: bool = False
+) -> Dict[str, Any]:
+    """
+    The function `analyze_logs` streams every log file under `path` in parallel across processes and
+    merges their partial results as they arrive, so memory does not grow with the number of lines.
+
+    @param path The `path` parameter is the log directory. It defaults to `LOGGER_PATH`.
+    @param workers The `workers` parameter is the number of worker processes; 0 uses the CPU count.
+    @param by_hour The `by_hour` parameter groups the trend by hour instead of by day.
+
+    @return The function `analyze_logs` returns the number of `files`, the duration percentiles per
+    operation and the `trend` per period. Its `error_rate` is the share of runs with at least one
+    error: the share of error lines would move with the amount of debug logging.
+    """
+    logger_specials.was_called(__name__, analyze_logs.__name__)
+    period: int = 13 if by_hour else 10
+    total: Partial = {"operations": {}, "trend": {}, "files": 0}
+    files: List[str] = list(__log_files(path))
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        for partial in executor.map(
+            analyze_log_file, files, [period] * len(files), chunksize=16
+        ):
+            __merge(total, partial)
+
+    report: Dict[str, Any] = {
+        "path": path,
+        "files": total["files"],
+        "operations": {
+            operation: {
+                "count": histogram.count,
+                "mean": histogram.sum / histogram.count,
+                "p50": histogram.quantile(0.5),
+                "p90": histogram.quantile(0.9),
+                "p99": histogram.quantile(0.99),
+            }
+            for operation, histogram in sorted(total["operations"].items())
+        },
+        "trend": [
+            {
+                "period": key,
+                "runs": runs,
+                "failed_runs": failed,
+                "lines": lines,
+                "errors": errors,
+                "error_rate": failed / runs if runs else 0.0,
+            }
+            for key, (lines, errors, runs, failed) in sorted(total["trend"].items())
+        ],
+    }
+    logger_specials.value_retured("report.files", report["files"], analyze_logs)
+    return report
+
+
+def analyze_logs_main() -> int:
+    """
+    The function `analyze_logs_main` prints the report of `analyze_logs` and writes it next to the log
+    file as `<log>.logs.json`.
+
+    @return The function `analyze_logs_main` returns 0 once the report is written.
+    """
+    logger_specials.was_called(__name__, analyze_logs_main.__name__)
+    report: Dict[str, Any] = analyze_logs(
+        args.analyzeLogsPath or LOGGER_PATH, by_hour=args.analyzeLogsByHour
+    )
+    prt(f"Log files: {report['files']}")
+    for operation, stats in report["operations"].items():
+        prt(
+            f"{operation}: n={stats['count']}, p50={stats['p50'] * 1000:.3f} ms, "
+            f"p90={stats['p90'] * 1000:.3f} ms, p99={stats['p99'] * 1000:.3f} ms"
+        )
+    for row in report["trend"]:
+        prt(
+            f"{row['period']}: runs={row['runs']}, failed={row['failed_runs']} "
+            f"({row['error_rate']:.2%}), errors={row['errors']}/{row['lines']} lines"
+        )
+    write_file(
+        f"{LOGGER_FILE.removesuffix('.log')}.logs.json", json.dumps(report, indent=2)
+    )
+    return 0
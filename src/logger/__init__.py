@@ -9,12 +9,44 @@ Copyright (c) 2024 zperk
 
 __all__ = ["logger", "logger_specials"]
 
+import atexit as _atexit
 import logging as _logging
+import multiprocessing as _multiprocessing
 import os as _os
+import signal as _signal
+import threading as _threading
+import time as _time
 import traceback as _traceback
-from typing import Callable, Dict, Any, Tuple, List
+from collections import deque as _deque
+from typing import Callable, Dict, Any, Deque, Tuple, List
 
 from src import const
+from src.args import args
+
+
+class _FlightRecorder(_logging.Handler):
+    def __init__(self, capacity: int) -> None:
+        """
+        The function initializes a handler that keeps the last `capacity` records in memory.
+
+        @param capacity The `capacity` parameter is the number of records kept; older records are
+        dropped as new ones arrive.
+        """
+        super().__init__(_logging.DEBUG)
+        self.records: Deque[_logging.LogRecord] = _deque(maxlen=capacity)
+
+    def handle(self, record: _logging.LogRecord) -> bool:
+        """
+        The function `handle` stores the record without formatting it or taking the handler lock
+        (appending to a deque is atomic), which keeps the steady-state cost close to zero. Warnings
+        and errors are left to the file handler, which writes them as they happen.
+        """
+        if record.levelno < _logging.WARNING:
+            self.records.append(record)
+        return True
+
+    def emit(self, record: _logging.LogRecord) -> None:
+        self.handle(record)
 
 
 class __Logger:
@@ -27,13 +59,25 @@ class __Logger:
         self.__log_path: str = const.LOGGER_PATH
         self.__logger: _logging.Logger = _logging.getLogger(__name__)
         self.__logger.setLevel(_logging.DEBUG)
+        self.__recorder: _FlightRecorder | None = None
         self.__start_logger()
+        if args.flightRecorder > 0:
+            self.__start_flight_recorder(args.flightRecorder)
         self.info("Logger started.")
 
     def __start_logger(self) -> None:
         """
-        The function `__start_logger` sets up a file logger.
+        The function `__start_logger` sets up a file logger. Worker processes (started by the
+        process pools of the analytics, benchmark and log analysis) import this module again; they
+        get a handler that discards the records, so they neither rotate the log directory nor
+        truncate the log file of the main process.
         """
+        if _multiprocessing.parent_process() is not None:
+            self.__handler: _logging.Handler = _logging.NullHandler()
+            self.__logger.addHandler(self.__handler)
+            self.__default_handler: _logging.Handler = self.__handler
+            return
+
         # Ensure the directory exists
         logger_directory: str = _os.path.dirname(self.__log_file)
         if not _os.path.exists(logger_directory):
@@ -64,6 +108,89 @@ class __Logger:
 
         # Add the handler to the logger
         self.__logger.addHandler(logger_handler)
+        self.__handler = logger_handler
+        self.__default_handler = logger_handler
+
+    def use_handler(self, handler: _logging.Handler | None = None) -> _logging.Handler:
+        """
+        The function `use_handler` replaces the handler the records are written to, for example with
+        a `NullHandler` so that a benchmark measures the logging calls without writing the log file.
+        It keeps the level of the replaced handler.
+
+        @param handler The `handler` parameter is the new handler. Without it, the log file is used
+        again.
+
+        @return The function `use_handler` returns the previous handler, to restore it afterwards.
+        """
+        previous: _logging.Handler = self.__handler
+        self.__handler = handler if handler is not None else self.__default_handler
+        self.__handler.setLevel(previous.level)
+        self.__logger.removeHandler(previous)
+        self.__logger.addHandler(self.__handler)
+        return previous
+
+    def __start_flight_recorder(self, capacity: int) -> None:
+        """
+        The function `__start_flight_recorder` keeps the debug and info records in a ring buffer of
+        `capacity` records, so only warnings and errors are written to the log file as they happen.
+        The buffer is dumped to the log file by `dump_flight_recorder`, which also runs on SIGUSR1 and
+        SIGTERM.
+        """
+        self.__recorder = _FlightRecorder(capacity)
+        self.__handler.setLevel(_logging.WARNING)
+        self.__logger.addHandler(self.__recorder)
+
+        def on_signal(signum: int, frame: Any) -> None:
+            self.dump_flight_recorder(f"signal {_signal.Signals(signum).name}")
+            if signum == _signal.SIGTERM:
+                raise SystemExit(128 + signum)
+
+        for name in ("SIGUSR1", "SIGTERM"):
+            if hasattr(_signal, name):
+                try:
+                    _signal.signal(getattr(_signal, name), on_signal)
+                except ValueError:
+                    # Signals can only be handled from the main thread.
+                    pass
+
+    def dump_flight_recorder(self, reason: str = "") -> int:
+        """
+        The function `dump_flight_recorder` writes the records kept by the flight recorder to the log
+        file, oldest first, and empties it. It does nothing when the flight recorder is disabled.
+
+        @param reason The `reason` parameter describes why the buffer is dumped (for example
+        "exception"). It is written before the records.
+
+        @return The function `dump_flight_recorder` returns the number of records written.
+        """
+        if self.__recorder is None:
+            return 0
+        records: List[_logging.LogRecord] = []
+        while self.__recorder.records:
+            records.append(self.__recorder.records.popleft())
+        self.__logger.warning(
+            f"Flight recorder dump ({reason or 'requested'}): {len(records)} records follow."
+        )
+        for record in records:
+            # `Handler.handle` ignores the handler level, so the buffered records are written too.
+            self.__handler.handle(record)
+        self.__handler.flush()
+        return len(records)
+
+    def write(self, message: Any) -> None:
+        """
+        The function `write` logs an informational message straight to the log file. Unlike `info`,
+        the message is written even when the flight recorder keeps the informational records in
+        memory, so summaries survive the end of the run.
+
+        @param message The `message` parameter is an object that represents the message to be written
+        at the 'INFO' level.
+        """
+        self.__handler.handle(
+            self.__logger.makeRecord(
+                self.__logger.name, _logging.INFO, "", 0, str(message), (), None
+            )
+        )
 
     def debug(self, message: Any) -> None:
         """
@@ -130,6 +257,80 @@ class __LoggerSpecials:
             "err": lambda arg: logger.error(arg),
             "crit": lambda arg: logger.critical(arg),
         }
+        # (kind, module, function) -> [calls, calls at the last summary, first time, last time]
+        self.__calls: Dict[Tuple[str, str, str], List[float]] = {}
+        self.__calls_lock = _threading.Lock()
+        self.__calls_interval: float = args.aggregateInterval
+        self.__calls_flushed: float = _time.monotonic()
+        self.__aggregate: bool = args.aggregateCalls
+        if self.__aggregate:
+            _atexit.register(self.flush_calls, "exit")
+
+    def __count(self, kind: str, module: str, function: str) -> None:
+        """
+        The function `__count` counts one call in memory instead of logging it, and writes the summary
+        once `-aggregateInterval` seconds have passed since the last one.
+        """
+        now: float = _time.time()
+        with self.__calls_lock:
+            counts: List[float] | None = self.__calls.get((kind, module, function))
+            if counts is None:
+                self.__calls[(kind, module, function)] = [1, 0, now, now]
+            else:
+                counts[0] += 1
+                counts[3] = now
+            due: bool = (
+                self.__calls_interval > 0
+                and _time.monotonic() - self.__calls_flushed >= self.__calls_interval
+            )
+        if due:
+            self.flush_calls("interval")
+
+    def flush_calls(self, reason: str = "") -> int:
+        """
+        The function `flush_calls` writes one summary line per (module, function) called since the
+        last summary, with its total calls, the calls since the last summary and its first and last
+        call times, straight to the log file (past the flight recorder). It does nothing unless
+        `-aggregateCalls` was given.
+
+        @param reason The `reason` parameter describes why the summary is written (for example
+        "exit"). It is written before the lines.
+
+        @return The function `flush_calls` returns the number of summary lines written.
+        """
+        with self.__calls_lock:
+            self.__calls_flushed = _time.monotonic()
+            changed: List[Tuple[Tuple[str, str, str], List[float]]] = [
+                (key, list(counts))
+                for key, counts in sorted(self.__calls.items())
+                if counts[0] > counts[1]
+            ]
+            for key, _ in changed:
+                self.__calls[key][1] = self.__calls[key][0]
+        if not changed:
+            return 0
+        moment: Callable[[float], str] = lambda seconds: _time.strftime(
+            "%Y-%m-%d %H:%M:%S", _time.localtime(seconds)
+        )
+        logger.write(
+            f"Call summary ({reason or 'requested'}): {len(changed)} lines follow."
+        )
+        for (kind, module, function), (calls, flushed, first, last) in changed:
+            name: str = (
+                function
+                if module == ""
+                else (
+                    f"{function} in {module}"
+                    if kind == "set"
+                    else f"{module}.{function}"
+                )
+            )
+            logger.write(
+                f"CALLS {kind}: {name} "
+                f"x{calls:.0f} (+{calls - flushed:.0f}), first {moment(first)}, "
+                f"last {moment(last)}."
+            )
+        return len(changed)
 
     def __handle_logger_message(self, key: str, message: Any) -> None:
         """
@@ -160,6 +361,9 @@ class __LoggerSpecials:
         represents the message to be logged. It is the information or content that you want to include
         in the log message when this function is called.
         """
+        if self.__aggregate:
+            self.__count("from", name, func)
+            return
         format_msg: str = (
             f"FROM: {'' if name == '' else f'{name}.'}{func}({func_args})"
             + (f", {message}" if message != "" else "")
@@ -281,6 +485,9 @@ class __LoggerSpecials:
         @param key The key parameter indicates the logging level for the message.
         @param init The init parameter represents the initialization point if name is not provided.
         """
+        if self.__aggregate:
+            self.__count("called", name if name != "" else init, func_name)
+            return
         self.__handle_logger_message(
             key,
             f"The function '{func_name}' was called. "
@@ -304,6 +511,15 @@ class __LoggerSpecials:
         included in the log message.
         @param callable The callable parameter denotes the initialization call.
         """
+        if self.__aggregate:
+            # Without a callable there is no setter to group by, only the value name.
+            setter: str = (
+                ""
+                if callable is object
+                else f"{callable.__module__}.{callable.__name__}"
+            )
+            self.__count("set", setter, value_name)
+            return
         self.__handle_logger_message(
             "debug",
             f"Value {value_name}, was set to {value}."
@@ -0,0 +1,262 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["Histogram", "LATENCY_BUCKETS", "ENDPOINT_TYPES", "endpoint_type", "metrics"]
+
+import json
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Tuple
+
+from src.const import *
+from src.file_handler import *
+from src.logger import *
+from src.routes import RESOURCE_TYPES, parse_route
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    float("inf"),
+)
+"""
+The upper bounds, in seconds, of the latency histogram buckets.
+"""
+
+ENDPOINT_TYPES: Tuple[str, ...] = RESOURCE_TYPES
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_type(route: str) -> str:
+    """
+    The function `endpoint_type` returns the SWAPI resource type addressed by `route`.
+
+    @param route The `route` parameter is the requested URL.
+
+    @return The resource type (for example "films"), "root" for the API root or "other" for anything
+    else.
+    """
+    return parse_route(route)[0]
+
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """
+        The function initializes an empty histogram with one (non-cumulative) counter per bucket.
+
+        @param bounds The `bounds` parameter holds the increasing upper bounds of the buckets. The
+        last one should be infinite so every value is counted.
+        """
+        self.bounds: Tuple[float, ...] = bounds
+        self.buckets: List[int] = [0] * len(bounds)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        The function `observe` counts `value` in the first bucket whose upper bound is not lower.
+        """
+        self.buckets[min(bisect_left(self.bounds, value), len(self.bounds) - 1)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """
+        The function `merge` adds the counts of `other`, which must share the same bounds.
+
+        @return The histogram itself, so merges can be chained.
+        """
+        for index, amount in enumerate(other.buckets):
+            self.buckets[index] += amount
+        self.count += other.count
+        self.sum += other.sum
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        The function `quantile` estimates the `q` quantile by interpolating linearly inside the
+        bucket that holds it, the same way Prometheus' `histogram_quantile` does.
+
+        @param q The `q` parameter is the quantile, between 0 and 1.
+
+        @return The estimated value, 0 for an empty histogram. Values beyond the last finite bound
+        are reported as that bound.
+        """
+        if self.count == 0:
+            return 0.0
+        rank: float = q * self.count
+        seen: int = 0
+        for index, amount in enumerate(self.buckets):
+            if amount and seen + amount >= rank:
+                upper: float = self.bounds[index]
+                lower: float = self.bounds[index - 1] if index > 0 else 0.0
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / amount
+            seen += amount
+        return self.bounds[-2] if len(self.bounds) > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The function `to_dict` returns the histogram as a JSON serializable dictionary.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): amount
+                for bound, amount in zip(self.bounds, self.buckets)
+            },
+        }
+
+
+class __Metrics:
+    def __init__(self) -> None:
+        """
+        The function initializes the per-endpoint latency histograms and the labelled counters.
+        """
+        self.__lock = threading.Lock()
+        self.__latency: Dict[str, Histogram] = {}
+        self.__counters: Dict[str, Dict[Labels, float]] = {}
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        """
+        The function `increment` adds `amount` to the counter `name` with the given labels.
+
+        @param name The `name` parameter is the counter name, without the `swapi_` prefix.
+        @param amount The `amount` parameter is the value added to the counter.
+        @param labels The `labels` parameter holds the label values of the counter (for example
+        `endpoint="films"`).
+        """
+        key: Labels = tuple(sorted(labels.items()))
+        with self.__lock:
+            counter: Dict[Labels, float] = self.__counters.setdefault(name, {})
+            counter[key] = counter.get(key, 0) + amount
+
+    def record_request(
+        self, route: str, seconds: float, size: int, status: int, retries: int = 0
+    ) -> None:
+        """
+        The function `record_request` records one request that reached the network.
+
+        @param route The `route` parameter is the requested URL.
+        @param seconds The `seconds` parameter is the latency of the request, retries included.
+        @param size The `size` parameter is the number of bytes of the response body.
+        @param status The `status` parameter is the HTTP status code, 0 if no response arrived.
+        @param retries The `retries` parameter is the number of retries the request needed.
+        """
+        endpoint: str = endpoint_type(route)
+        with self.__lock:
+            self.__latency.setdefault(endpoint, Histogram()).observe(seconds)
+        self.increment("requests_total", endpoint=endpoint, status=str(status))
+        self.increment("response_bytes_total", size, endpoint=endpoint)
+        if retries:
+            self.increment("retries_total", retries, endpoint=endpoint)
+
+    def record_cache_hit(self, route: str) -> None:
+        """
+        The function `record_cache_hit` records a request that was answered without the network.
+        """
+        self.increment("cache_hits_total", endpoint=endpoint_type(route))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        The function `summary` returns every histogram and counter as a JSON serializable dictionary.
+        """
+        with self.__lock:
+            return {
+                "log_file": LOGGER_FILE,
+                "latency_seconds": {
+                    endpoint: histogram.to_dict()
+                    for endpoint, histogram in sorted(self.__latency.items())
+                },
+                "counters": {
+                    name: [
+                        {"labels": dict(labels), "value": value}
+                        for labels, value in sorted(counter.items())
+                    ]
+                    for name, counter in sorted(self.__counters.items())
+                },
+            }
+
+    def prometheus(self) -> str:
+        """
+        The function `prometheus` renders every histogram and counter in the Prometheus text
+        exposition format.
+        """
+        lines: List[str] = [
+            "# HELP swapi_request_duration_seconds Latency of the SWAPI requests.",
+            "# TYPE swapi_request_duration_seconds histogram",
+        ]
+        quantiles: List[str] = [
+            "# HELP swapi_request_duration_quantile_seconds Estimated latency quantiles.",
+            "# TYPE swapi_request_duration_quantile_seconds gauge",
+        ]
+        with self.__lock:
+            for endpoint, histogram in sorted(self.__latency.items()):
+                cumulative: int = 0
+                for bound, amount in zip(histogram.bounds, histogram.buckets):
+                    cumulative += amount
+                    le: str = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(
+                        f'swapi_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'swapi_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram.sum}'
+                )
+                lines.append(
+                    f'swapi_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram.count}'
+                )
+                for q in (0.5, 0.9, 0.99):
+                    quantiles.append(
+                        f'swapi_request_duration_quantile_seconds{{endpoint="{endpoint}",quantile="{q}"}} '
+                        f"{histogram.quantile(q)}"
+                    )
+            lines.extend(quantiles)
+            for name, counter in sorted(self.__counters.items()):
+                lines.append(f"# TYPE swapi_{name} counter")
+                for labels, value in sorted(counter.items()):
+                    rendered: str = ",".join(f'{key}="{val}"' for key, val in labels)
+                    lines.append(f"swapi_{name}{{{rendered}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, log_file: str = "") -> None:
+        """
+        The function `export` writes the summary next to the log file, as `<log>.metrics.json` and
+        `<log>.prom`. Nothing is written if no request was recorded.
+
+        @param log_file The `log_file` parameter is the log file the summary belongs to. It defaults
+        to `LOGGER_FILE`.
+        """
+        if not (self.__latency or self.__counters):
+            logger.debug("No request metrics were recorded, nothing to export.")
+            return
+        base: str = (log_file or LOGGER_FILE).removesuffix(".log")
+        write_file(f"{base}.metrics.json", json.dumps(self.summary(), indent=2))
+        write_file(f"{base}.prom", self.prometheus())
+        logger.info(f"Request metrics exported to: {base}.metrics.json, {base}.prom")
+
+
+metrics = __Metrics()
+"""
+This instance collects the request metrics of the current run.
+"""
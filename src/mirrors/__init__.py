@@ -0,0 +1,194 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["MirrorPool"]
+
+import threading
+import time
+from typing import List, Tuple
+
+from src.logger import *
+from src.metrics import metrics
+
+
+class _Mirror:
+    def __init__(self, base: str) -> None:
+        """
+        The function initializes the health of one mirror: its EWMA latency (unknown until its first
+        answer), its consecutive failures, the time its ejection ends and whether a probe request is
+        in flight.
+        """
+        self.base: str = base
+        self.ewma: float | None = None
+        self.failures: int = 0
+        self.ejected_until: float = 0.0
+        self.cooldown: float = 0.0
+        self.probe: bool = False
+
+
+class MirrorPool:
+    def __init__(
+        self,
+        bases: List[str],
+        aliases: List[str] | None = None,
+        alpha: float = 0.3,
+        max_failures: int = 3,
+        cooldown: float = 30.0,
+    ) -> None:
+        """
+        The function initializes a pool of SWAPI-compatible mirrors. Requests go to the healthy mirror
+        with the lowest EWMA latency; a mirror failing `max_failures` times in a row is ejected for
+        `cooldown` seconds, then probed again with a single request (the cooldown doubles, up to ten
+        times, each time a probe fails). When every mirror is ejected, requests still go to the one
+        released first, but their failures do not extend its cooldown.
+
+        @param bases The `bases` parameter lists the base URLs of the mirrors, for example
+        `https://swapi.dev/api`.
+        @param aliases The `aliases` parameter lists other base URLs that may appear in requested
+        routes and responses, such as the default `SWAPI`; they are rewritten but never requested.
+        @param alpha The `alpha` parameter is the weight of the newest latency in the EWMA.
+        @param max_failures The `max_failures` parameter is the number of consecutive failures that
+        ejects a mirror.
+        @param cooldown The `cooldown` parameter is the number of seconds a mirror stays ejected.
+        """
+        self.__mirrors: List[_Mirror] = [_Mirror(base.rstrip("/")) for base in bases]
+        self.__known: List[str] = sorted(
+            {mirror.base for mirror in self.__mirrors}
+            | {alias.rstrip("/") for alias in aliases or []},
+            key=len,
+            reverse=True,
+        )
+        self.alpha: float = alpha
+        self.max_failures: int = max_failures
+        self.cooldown: float = cooldown
+        self.__lock = threading.Lock()
+
+    def split(self, route: str) -> Tuple[str, str]:
+        """
+        The function `split` splits `route` into the known base URL it starts with and the rest.
+
+        @return A `(base, path)` tuple; `base` is empty when the route belongs to no known mirror.
+        """
+        for base in self.__known:
+            if route.startswith(base):
+                return base, route[len(base) :]
+        return "", route
+
+    def rewrite(self, route: str, base: str) -> str:
+        """
+        The function `rewrite` returns `route` on the mirror `base`. Unknown routes are unchanged.
+        """
+        known, path = self.split(route)
+        return base + path if known else route
+
+    def rewrite_payload(self, content: bytes, base: str) -> bytes:
+        """
+        The function `rewrite_payload` points every cross-resource URL of a response body (of any
+        known mirror) to the mirror `base`.
+        """
+        target: bytes = base.encode()
+        for known in self.__known:
+            if known != base:
+                content = content.replace(known.encode(), target)
+        return content
+
+    def __ranked(self) -> List[_Mirror]:
+        """
+        The function `__ranked` returns the mirrors that may receive a request, best first. Ejected
+        mirrors whose cooldown is over come first, to be probed; then mirrors without a latency yet,
+        so every mirror gets measured; then the others by EWMA latency. If every mirror is ejected,
+        the one released first is used.
+        """
+        now: float = time.monotonic()
+        available: List[_Mirror] = [
+            mirror for mirror in self.__mirrors if mirror.ejected_until <= now
+        ]
+        if not available:
+            return sorted(self.__mirrors, key=lambda mirror: mirror.ejected_until)
+        return sorted(
+            available,
+            key=lambda mirror: (
+                mirror.failures < self.max_failures,
+                -1.0 if mirror.ewma is None else mirror.ewma,
+            ),
+        )
+
+    def choose(self) -> str:
+        """
+        The function `choose` returns the base URL of the mirror the next request is sent to. A mirror
+        chosen as a probe (once its cooldown is over) stays reserved for that single request until it
+        is observed.
+        """
+        with self.__lock:
+            mirror: _Mirror = self.__ranked()[0]
+            now: float = time.monotonic()
+            if mirror.failures >= self.max_failures and mirror.ejected_until <= now:
+                mirror.ejected_until = now + mirror.cooldown
+                mirror.probe = True
+            return mirror.base
+
+    def alternate(self, route: str) -> str:
+        """
+        The function `alternate` returns `route` on the second best mirror (for hedged requests), or
+        on the best one when the route is not already there.
+        """
+        with self.__lock:
+            ranked: List[str] = [mirror.base for mirror in self.__ranked()]
+        base, _ = self.split(route)
+        candidates: List[str] = [candidate for candidate in ranked if candidate != base]
+        return self.rewrite(route, candidates[0]) if candidates else route
+
+    def observe(self, base: str, seconds: float, ok: bool) -> None:
+        """
+        The function `observe` updates the health of the mirror `base` after a request.
+
+        @param base The `base` parameter is the mirror the request was sent to.
+        @param seconds The `seconds` parameter is the latency of the request.
+        @param ok The `ok` parameter tells whether the mirror answered properly. A failure also
+        counts as a latency of `seconds`, so a failing mirror loses its rank before being ejected.
+        """
+        with self.__lock:
+            mirror: _Mirror | None = next(
+                (mirror for mirror in self.__mirrors if mirror.base == base), None
+            )
+            if mirror is None:
+                return
+            mirror.ewma = (
+                seconds
+                if mirror.ewma is None
+                else self.alpha * seconds + (1 - self.alpha) * mirror.ewma
+            )
+            if ok:
+                if mirror.failures >= self.max_failures:
+                    logger.info(
+                        f"Mirror {base} answered its probe, it is healthy again."
+                    )
+                mirror.failures = 0
+                mirror.cooldown = 0.0
+                mirror.ejected_until = 0.0
+                mirror.probe = False
+                return
+            mirror.failures += 1
+            if mirror.failures < self.max_failures:
+                return
+            if mirror.probe:
+                mirror.probe = False
+                mirror.cooldown = min(mirror.cooldown * 2, self.cooldown * 1024)
+            elif mirror.failures == self.max_failures:
+                mirror.cooldown = self.cooldown
+            else:
+                # Not the probe: a request sent while every mirror was ejected, or sent before the
+                # ejection. It keeps the mirror ejected without backing off further.
+                mirror.ejected_until = max(
+                    mirror.ejected_until, time.monotonic() + mirror.cooldown
+                )
+                return
+            mirror.ejected_until = time.monotonic() + mirror.cooldown
+        logger.warning(f"Mirror {base} ejected for {mirror.cooldown:.0f} s.")
+        metrics.increment("mirror_ejections_total", mirror=base)
@@ -0,0 +1,76 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["RESOURCE_TYPES", "parse_route", "resource_id", "resource_key", "route_path"]
+
+from typing import Any, List, Tuple
+from urllib.parse import urlsplit
+
+RESOURCE_TYPES: Tuple[str, ...] = (
+    "films",
+    "people",
+    "planets",
+    "species",
+    "starships",
+    "vehicles",
+)
+"""
+The resource types of SWAPI.
+"""
+
+
+def parse_route(route: str) -> Tuple[str, int | None]:
+    """
+    The function `parse_route` returns what a SWAPI URL addresses, whichever host or mirror it
+    points to.
+
+    @param route The `route` parameter is the URL, for example `https://swapi.dev/api/people/13/`.
+
+    @return A `(kind, id)` tuple: `kind` is the resource type (for example "people"), "root" for the
+    API root or "other" for anything else; `id` is the resource ID, or `None` for a list page.
+    """
+    segments: List[str] = [part for part in urlsplit(route).path.split("/") if part]
+    if segments and segments[-1] == "api":
+        return "root", None
+    for index, segment in enumerate(segments):
+        if segment in RESOURCE_TYPES:
+            rest: List[str] = segments[index + 1 :]
+            return segment, int(rest[0]) if rest and rest[0].isdigit() else None
+    return "other", None
+
+
+def resource_id(route: Any) -> int | None:
+    """
+    The function `resource_id` returns the ID of a resource URL, or `None` for anything else
+    (including values that are not strings, such as a missing field).
+    """
+    return parse_route(route)[1] if isinstance(route, str) else None
+
+
+def resource_key(route: str) -> str:
+    """
+    The function `resource_key` returns a host-independent key for a URL: "type/ID" for a resource,
+    "type?query" for a list page, "root" for the API root and the URL itself otherwise. The same
+    resource has the same key whichever mirror its URL points to.
+    """
+    kind, index = parse_route(route)
+    if index is not None:
+        return f"{kind}/{index}"
+    if kind in RESOURCE_TYPES:
+        query: str = urlsplit(route).query
+        return kind + (f"?{query}" if query else "")
+    return "root" if kind == "root" else route
+
+
+def route_path(route: str) -> str:
+    """
+    The function `route_path` returns the path and query of a URL, without its scheme and host.
+    """
+    parts: Any = urlsplit(route)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
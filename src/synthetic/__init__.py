@@ -0,0 +1,265 @@
+"""
+This software is provided "as is" without warranty of any kind, express or implied, including but not 
+limited to the warranties of merchantability, fitness for a particular purpose, and non-infringement. 
+In no event shall the authors or copyright holders be liable for any claim, damages, or other liability, 
+whether in an action of contract, tort, or otherwise, arising from, out of, or in connection with the software 
+or the use or other dealings in the software.
+Copyright (c) 2024 zperk
+"""
+
+__all__ = ["RESOURCES", "dataset_file", "generate_dataset", "synthetic_main"]
+
+import json
+import random
+from array import array
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.args import args
+from src.const import *
+from src.file_handler import *
+from src.logger import *
+
+RESOURCES: Tuple[str, ...] = ("planets", "people", "species", "starships", "films")
+"""
+The resource types written by `generate_dataset`, one JSON-lines file each.
+"""
+
+__FILM_TITLES: List[str] = [
+    "A New Hope",
+    "The Empire Strikes Back",
+    "Return of the Jedi",
+    "The Phantom Menace",
+    "Attack of the Clones",
+    "Revenge of the Sith",
+]
+__SPECIES_NAMES: List[str] = ["Human", "Droid", "Wookiee", "Rodian", "Hutt"]
+__CLIMATES: List[str] = [
+    "arid",
+    "temperate",
+    "tropical",
+    "frozen",
+    "murky",
+    "temperate, arid",
+    "arid, temperate, tropical",
+    "windy",
+    "hot",
+    "superheated",
+]
+__TERRAINS: List[str] = ["desert", "grasslands", "mountains", "jungle", "tundra"]
+__CHUNK: int = 10_000
+
+
+def dataset_file(path: str, resource: str) -> str:
+    """
+    The function `dataset_file` returns the JSON-lines file holding a resource type of a dataset.
+
+    @param path The `path` parameter is the directory of the dataset.
+    @param resource The `resource` parameter is one of `RESOURCES`.
+
+    @return The absolute file name of the resource type.
+    """
+    return f"{path}/{resource}.jsonl"
+
+
+def __url(resource: str, index: int) -> str:
+    return f"{SWAPI}/{resource}/{index}/"
+
+
+def __urls(resource: str, indexes: Any) -> List[str]:
+    return [f"{SWAPI}/{resource}/{index}/" for index in indexes]
+
+
+def __film_ids(salt: int, index: int, films: int) -> List[int]:
+    """
+    The function `__film_ids` deterministically spreads an entity over one to three films, so that the
+    inverse relationship can be accumulated while the entity is written.
+    """
+    mixed: int = (index * 2654435761 + salt) & 0xFFFFFFFF
+    amount: int = 1 + mixed % min(3, films)
+    first: int = (mixed >> 8) % films
+    return sorted({(first + step * 2) % films + 1 for step in range(amount)})
+
+
+def __write_resource(
+    path: str,
+    resource: str,
+    amount: int,
+    build: Callable[[int], Dict[str, Any]],
+) -> None:
+    """
+    The function `__write_resource` writes `amount` records of a resource type in chunks, so memory
+    stays bounded regardless of the dataset size.
+    """
+    file_name: str = dataset_file(path, resource)
+    write_file(file_name, "")
+    lines: List[str] = []
+    for index in range(1, amount + 1):
+        lines.append(json.dumps(build(index), separators=(",", ":")))
+        if len(lines) == __CHUNK:
+            write_file(file_name, "\n".join(lines) + "\n", "a")
+            lines = []
+    if lines:
+        write_file(file_name, "\n".join(lines) + "\n", "a")
+    logger.info(f"Synthetic {resource}: {amount} records written to '{file_name}'.")
+
+
+def generate_dataset(
+    path: str,
+    planets: int = 1_000_000,
+    people: int = 1_000_000,
+    starships: int = 1_000_000,
+    species: int = 1_000,
+    films: int = 6,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """
+    The function `generate_dataset` writes a SWAPI-shaped dataset with bidirectional cross-links to
+    `path`, one JSON-lines file per resource type.
+
+    People are spread over planets and species by their index, so residents and species members are
+    computed arithmetically; film membership is hashed and its inverse is accumulated in compact
+    integer arrays, which keeps the generator's memory proportional to the links of the films only.
+
+    @param path The `path` parameter is the directory where the dataset is written. It is created if
+    it does not exist.
+    @param planets The `planets` parameter is the number of planets to generate.
+    @param people The `people` parameter is the number of people to generate.
+    @param starships The `starships` parameter is the number of starships to generate.
+    @param species The `species` parameter is the number of species to generate. The canonical
+    species names (including "Wookiee") are used first.
+    @param films The `films` parameter is the number of films to generate. The canonical titles
+    (starting with "A New Hope") are used first.
+    @param seed The `seed` parameter seeds the random attributes of the records.
+
+    @return The function `generate_dataset` returns a dictionary mapping each resource type to the
+    number of records written.
+    """
+    logger_specials.was_called(__name__, generate_dataset.__name__)
+    create_directory(path)
+    rng = random.Random(seed)
+    film_links: Dict[str, List[Any]] = {
+        resource: [array("I") for _ in range(films)]
+        for resource in ("planets", "people", "species", "starships")
+    }
+
+    def link_films(resource: str, salt: int, index: int) -> List[str]:
+        ids: List[int] = __film_ids(salt, index, films)
+        for film_id in ids:
+            film_links[resource][film_id - 1].append(index)
+        return __urls("films", ids)
+
+    def planet(index: int) -> Dict[str, Any]:
+        return {
+            "name": f"Planet-{index}",
+            "rotation_period": str(rng.randint(10, 40)),
+            "orbital_period": str(rng.randint(200, 600)),
+            "diameter": str(rng.randint(1000, 20000)),
+            "climate": rng.choice(__CLIMATES),
+            "gravity": "1 standard",
+            "terrain": rng.choice(__TERRAINS),
+            "surface_water": str(rng.randint(0, 100)),
+            "population": str(rng.randint(0, 10**9)),
+            "residents": __urls("people", range(index, people + 1, planets)),
+            "films": link_films("planets", 1, index),
+            "url": __url("planets", index),
+        }
+
+    def person(index: int) -> Dict[str, Any]:
+        return {
+            "name": f"Person-{index}",
+            "height": str(rng.randint(60, 250)),
+            "mass": str(rng.randint(20, 200)),
+            "gender": rng.choice(["male", "female", "n/a"]),
+            "birth_year": f"{rng.randint(1, 900)}BBY",
+            "homeworld": __url("planets", (index - 1) % planets + 1),
+            "films": link_films("people", 2, index),
+            "species": [__url("species", (index - 1) % species + 1)],
+            "starships": __urls("starships", range(index, starships + 1, people)),
+            "url": __url("people", index),
+        }
+
+    def kind(index: int) -> Dict[str, Any]:
+        return {
+            "name": (
+                __SPECIES_NAMES[index - 1]
+                if index <= len(__SPECIES_NAMES)
+                else f"Species-{index}"
+            ),
+            "classification": rng.choice(["mammal", "reptile", "artificial"]),
+            "average_height": str(rng.randint(50, 300)),
+            "homeworld": __url("planets", (index - 1) % planets + 1),
+            "language": f"Language-{index}",
+            "people": __urls("people", range(index, people + 1, species)),
+            "films": link_films("species", 3, index),
+            "url": __url("species", index),
+        }
+
+    def starship(index: int) -> Dict[str, Any]:
+        return {
+            "name": f"Starship-{index}",
+            "model": f"Model-{index % 997}",
+            "starship_class": rng.choice(["corvette", "starfighter", "freighter"]),
+            "length": f"{rng.uniform(5, 20000):,.1f}",
+            "crew": str(rng.randint(1, 50000)),
+            "pilots": [__url("people", (index - 1) % people + 1)],
+            "films": link_films("starships", 4, index),
+            "url": __url("starships", index),
+        }
+
+    def film(index: int) -> Dict[str, Any]:
+        return {
+            "title": (
+                __FILM_TITLES[index - 1]
+                if index <= len(__FILM_TITLES)
+                else f"Film {index}"
+            ),
+            "episode_id": index,
+            "director": "George Lucas",
+            "release_date": f"{1976 + index}-05-25",
+            "planets": __urls("planets", film_links["planets"][index - 1]),
+            "characters": __urls("people", film_links["people"][index - 1]),
+            "species": __urls("species", film_links["species"][index - 1]),
+            "starships": __urls("starships", film_links["starships"][index - 1]),
+            "url": __url("films", index),
+        }
+
+    amounts: Dict[str, int] = {
+        "planets": planets,
+        "people": people,
+        "species": species,
+        "starships": starships,
+        "films": films,
+    }
+    builders: Dict[str, Callable[[int], Dict[str, Any]]] = {
+        "planets": planet,
+        "people": person,
+        "species": kind,
+        "starships": starship,
+        "films": film,
+    }
+    # Films go last: their relationship lists are the inverse of everything written before.
+    for resource in RESOURCES:
+        __write_resource(path, resource, amounts[resource], builders[resource])
+
+    logger_specials.value_was_set("amounts", amounts, generate_dataset)
+    return amounts
+
+
+def synthetic_main() -> int:
+    """
+    The function `synthetic_main` generates the dataset requested through the `-synthetic` and
+    `-syntheticSize` command line arguments.
+
+    @return The function `synthetic_main` returns 0 once the dataset is written.
+    """
+    logger_specials.was_called(__name__, synthetic_main.__name__)
+    size: int = args.syntheticSize
+    generate_dataset(
+        args.synthetic,
+        planets=size,
+        people=size,
+        starships=size,
+        species=max(len(__SPECIES_NAMES), size // 1000),
+        films=max(len(__FILM_TITLES), min(size // 10_000, 600)),
+    )
+    return 0
@@ -62,6 +62,7 @@ def timer(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
         logger.critical(
             f"Unhandled exception raised in {func}:\n{ traceback.format_exc() }"
         )
+        logger.dump_flight_recorder(f"exception in {func}")
         raise
 
     __handle_end_timer(start, func)
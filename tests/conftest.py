@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# `src` parses the command line and opens its log file next to `sys.argv[0]` when it is imported,
+# so the tests run it without arguments from a temporary directory.
+sys.argv = [os.path.join(tempfile.mkdtemp(prefix="swapi-tests-"), "main.py")]
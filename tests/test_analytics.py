@@ -0,0 +1,55 @@
+import json
+from typing import Any, List
+
+import src.analytics as analytics
+from src.synthetic import dataset_file, generate_dataset
+
+read_records = vars(analytics)["__read_records"]
+shard_ranges = vars(analytics)["__shard_ranges"]
+
+
+def write_lines(tmp_path: Any) -> str:
+    file_name: str = str(tmp_path / "records.jsonl")
+    lines: List[str] = [
+        json.dumps({"id": index, "pad": "x" * index}) for index in range(12)
+    ]
+    lines.insert(5, "")
+    with open(file_name, "w") as file_object:
+        file_object.write("\n".join(lines) + "\n")
+    return file_name
+
+
+def test_every_split_point_yields_every_record_once(tmp_path: Any) -> None:
+    file_name: str = write_lines(tmp_path)
+    expected: List[Any] = list(read_records(file_name))
+    assert [record["id"] for record in expected] == list(range(12))
+    size: int = len(open(file_name, "rb").read())
+    for split in range(size + 1):
+        assert (
+            list(read_records(file_name, 0, split))
+            + list(read_records(file_name, split))
+            == expected
+        )
+
+
+def test_shards_cover_the_file(tmp_path: Any) -> None:
+    file_name: str = write_lines(tmp_path)
+    for shards in range(1, 40):
+        records: List[Any] = [
+            record
+            for start, end in shard_ranges(file_name, shards)
+            for record in read_records(file_name, start, end)
+        ]
+        assert [record["id"] for record in records] == list(range(12))
+
+
+def test_sharded_scan_matches_a_single_pass(tmp_path: Any) -> None:
+    generate_dataset(str(tmp_path), planets=500, people=50, starships=50, species=10)
+    file_name: str = dataset_file(str(tmp_path), "planets")
+    whole, scanned = analytics._scan_shard("arid", file_name, 0, -1, None)
+    partials = [
+        analytics._scan_shard("arid", file_name, start, end, None)
+        for start, end in shard_ranges(file_name, 7)
+    ]
+    assert set().union(*(value for value, _ in partials)) == whole
+    assert sum(count for _, count in partials) == scanned
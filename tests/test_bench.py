@@ -0,0 +1,40 @@
+from typing import Any, Dict, List
+
+import src.bench as bench
+
+mann_whitney = vars(bench)["__mann_whitney"]
+smallest_p_value = vars(bench)["__smallest_p_value"]
+
+
+def results(samples: List[float]) -> Dict[str, Any]:
+    return {"case": {"number": 1, "samples": samples}}
+
+
+def test_identical_samples_are_not_significant() -> None:
+    assert mann_whitney([1.0] * 10, [1.0] * 10) == 1.0
+    assert mann_whitney([1.0, 2.0, 3.0], [1.0, 2.0, 3.0]) > 0.5
+
+
+def test_separated_samples_are_significant() -> None:
+    base: List[float] = [1.0 + index / 100 for index in range(10)]
+    slower: List[float] = [2.0 + index / 100 for index in range(10)]
+    assert mann_whitney(base, slower) < 0.001
+    assert mann_whitney(base, slower) == mann_whitney(slower, base)
+
+
+def test_too_few_runs_cannot_reach_alpha() -> None:
+    assert smallest_p_value(3, 3) > 0.01
+    assert smallest_p_value(4, 4) > 0.01
+    assert smallest_p_value(5, 5) < 0.01
+
+
+def test_compare_flags_significant_slowdowns_only() -> None:
+    base: List[float] = [1.0 + index / 100 for index in range(10)]
+    slower: List[float] = [2.0 + index / 100 for index in range(10)]
+    (row,) = bench.compare(results(base), results(slower))
+    assert row["regression"] and row["ratio"] > 1.9
+    (row,) = bench.compare(results(base), results(list(reversed(base))))
+    assert not row["regression"]
+    # A 1% slowdown stays below the 5% threshold.
+    (row,) = bench.compare(results(base), results([value * 1.01 for value in base]))
+    assert not row["regression"]
@@ -0,0 +1,63 @@
+import gzip
+from typing import Any, List
+
+import pytest
+import requests
+
+from src.cassette import Cassette
+from src.fetch import make_response
+
+FILM: str = "https://swapi.dev/api/films/1/"
+DOWN: str = "https://swapi.dev/api/films/2/"
+
+
+def live(calls: List[str]) -> Any:
+    def transport(route: str, verify: bool) -> Any:
+        calls.append(route)
+        if route == DOWN:
+            raise requests.Timeout("No answer.")
+        return make_response(route, b'{"title": "A New Hope"}')
+
+    return transport
+
+
+def test_replay_answers_what_was_recorded(tmp_path: Any) -> None:
+    calls: List[str] = []
+    recording: Cassette = Cassette()
+    record: Any = recording.recorder(live(calls))
+    assert record(FILM, False).json() == {"title": "A New Hope"}
+    with pytest.raises(requests.Timeout):
+        record(DOWN, False)
+    recording.save(str(tmp_path / "cassette.jsonl.gz"))
+
+    play: Any = Cassette.load(str(tmp_path / "cassette.jsonl.gz")).player(speed=0)
+    # The replay is keyed by path, whichever host or mirror is requested.
+    response: Any = play("http://127.0.0.1:8765/api/films/1/", False)
+    assert (response.status_code, response.json()) == (200, {"title": "A New Hope"})
+    with pytest.raises(requests.Timeout):
+        play(DOWN, False)
+    assert play("https://swapi.dev/api/films/3/", False).status_code == 404
+    assert calls == [FILM, DOWN]
+
+
+def test_answers_of_a_route_are_replayed_in_order() -> None:
+    cassette: Cassette = Cassette(
+        [
+            {"route": "/api/", "status": 500, "seconds": 0.0, "body": "{}"},
+            {"route": "/api/", "status": 200, "seconds": 0.0, "body": "{}"},
+        ]
+    )
+    play: Any = cassette.player(speed=0)
+    assert [play("https://swapi.dev/api/", False).status_code for _ in range(3)] == [
+        500,
+        200,
+        200,
+    ]
+
+
+def test_other_versions_are_refused(tmp_path: Any) -> None:
+    file_name: str = str(tmp_path / "old.jsonl.gz")
+    with gzip.open(file_name, "wt") as file_object:
+        file_object.write('{"version": 0}\n')
+    with pytest.raises(ValueError):
+        Cassette.load(file_name)
@@ -0,0 +1,105 @@
+import json
+from typing import Any, Dict, Iterator, List, Set
+
+import pytest
+import requests
+
+from src.const import SWAPI
+from src.crawler import crawl, load_store
+from src.fetch import clear_cache, make_response, use_transport
+
+
+def person(index: int) -> Dict[str, Any]:
+    return {
+        "name": f"Person {index}",
+        "url": f"{SWAPI}/people/{index}/",
+        "films": [f"{SWAPI}/films/1/"],
+        "homeworld": f"{SWAPI}/planets/9/",
+    }
+
+
+PAGES: Dict[str, Any] = {
+    f"{SWAPI}/": {"people": f"{SWAPI}/people/", "films": f"{SWAPI}/films/"},
+    f"{SWAPI}/people/": {
+        "count": 3,
+        "next": f"{SWAPI}/people/?page=2",
+        "results": [person(1), person(2)],
+    },
+    f"{SWAPI}/people/?page=2": {"count": 3, "next": None, "results": [person(3)]},
+    f"{SWAPI}/films/": {
+        "count": 1,
+        "next": None,
+        "results": [
+            {
+                "title": "A New Hope",
+                "url": f"{SWAPI}/films/1/",
+                "characters": [f"{SWAPI}/people/{index}/" for index in (1, 2, 3)],
+            }
+        ],
+    },
+    # Linked from the people only, so it is fetched on its own.
+    f"{SWAPI}/planets/9/": {
+        "name": "Tatooine",
+        "url": f"{SWAPI}/planets/9/",
+        "residents": [f"{SWAPI}/people/1/"],
+    },
+}
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.down: Set[str] = set()
+
+    def __call__(self, route: str, verify: bool) -> Any:
+        self.calls.append(route)
+        if route in self.down:
+            raise requests.ConnectionError(f"{route} is down.")
+        if route not in PAGES:
+            return make_response(route, b'{"detail": "Not found"}', 404)
+        return make_response(route, json.dumps(PAGES[route]).encode())
+
+
+@pytest.fixture
+def api() -> Iterator[FakeApi]:
+    fake: FakeApi = FakeApi()
+    clear_cache()
+    previous = use_transport(fake)
+    try:
+        yield fake
+    finally:
+        use_transport(previous)
+        clear_cache()
+
+
+def test_crawl_stores_every_record_once(api: FakeApi, tmp_path: Any) -> None:
+    assert crawl(str(tmp_path), workers=2) == len(PAGES)
+    assert sorted(api.calls) == sorted(PAGES)
+    store = load_store(str(tmp_path))
+    assert {resource: sorted(rows) for resource, rows in store.items()} == {
+        "people": [1, 2, 3],
+        "films": [1],
+        "planets": [9],
+    }
+
+
+def test_interrupted_crawl_resumes_from_its_checkpoint(
+    api: FakeApi, tmp_path: Any
+) -> None:
+    api.down.add(f"{SWAPI}/planets/9/")
+    with pytest.raises(requests.ConnectionError):
+        crawl(str(tmp_path), workers=2, checkpoint_every=1)
+    with pytest.raises(ValueError, match="incomplete"):
+        load_store(str(tmp_path))
+
+    api.down.clear()
+    api.calls.clear()
+    clear_cache()
+    assert crawl(str(tmp_path), workers=2) == 1
+    assert api.calls == [f"{SWAPI}/planets/9/"]
+    assert sorted(load_store(str(tmp_path))["planets"]) == [9]
+
+
+def test_missing_store_is_refused(tmp_path: Any) -> None:
+    with pytest.raises(ValueError, match="not a store"):
+        load_store(str(tmp_path / "missing"))
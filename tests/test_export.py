@@ -0,0 +1,49 @@
+from datetime import date, datetime, timezone
+from typing import Any
+
+import pytest
+
+import src.export as export
+
+CONVERTERS = export._CONVERTERS
+
+
+def test_swapi_timestamps_parse_with_their_trailing_z() -> None:
+    assert CONVERTERS["timestamp"]("2014-12-09T13:50:51.644000Z") == datetime(
+        2014, 12, 9, 13, 50, 51, 644000, tzinfo=timezone.utc
+    )
+    assert CONVERTERS["timestamp"]("2014-12-09T13:50:51+00:00") == datetime(
+        2014, 12, 9, 13, 50, 51, tzinfo=timezone.utc
+    )
+    assert CONVERTERS["timestamp"]("unknown") is None
+
+
+def test_values_are_typed() -> None:
+    assert CONVERTERS["float"]("1,000,000") == 1_000_000.0
+    assert CONVERTERS["float"]("unknown") is None
+    assert CONVERTERS["int"]("n/a") is None
+    assert CONVERTERS["date"]("1977-05-25") == date(1977, 5, 25)
+    assert CONVERTERS["ref"]("https://swapi.dev/api/planets/1/") == 1
+    assert CONVERTERS["refs"](["https://swapi.dev/api/films/2/"]) == [2]
+    assert CONVERTERS["refs"](None) == []
+
+
+def test_export_writes_one_row_per_record(tmp_path: Any) -> None:
+    pa = pytest.importorskip("pyarrow")
+    film: Any = {
+        "title": "A New Hope",
+        "episode_id": 4,
+        "release_date": "1977-05-25",
+        "created": "2014-12-10T14:23:31.880000Z",
+        "characters": ["https://swapi.dev/api/people/1/"],
+        "url": "https://swapi.dev/api/films/1/",
+    }
+    rows = export.export_records(
+        [("films", film), ("films", film), ("unknown", {})], str(tmp_path)
+    )
+    assert rows == {"films": 1}
+    with pa.memory_map(str(tmp_path / "films.arrow")) as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.column("id").to_pylist() == [1]
+    assert table.column("characters").to_pylist() == [[1]]
+    assert table.column("created").to_pylist()[0].year == 2014
@@ -0,0 +1,72 @@
+import time
+from typing import Any, List
+
+from src.hedge import Hedger
+
+ROUTE: str = "https://swapi.dev/api/films/1/"
+MIRROR: str = "https://mirror.test/api/films/1/"
+
+
+class Response:
+    def __init__(self, url: str) -> None:
+        self.url: str = url
+        self.closed: bool = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def stalled_primary(sent: List[str], responses: List[Response] | None = None) -> Any:
+    def send(url: str) -> Response:
+        sent.append(url)
+        if url == ROUTE:
+            time.sleep(1.0)
+        response: Response = Response(url)
+        if responses is not None:
+            responses.append(response)
+        return response
+
+    return send
+
+
+def test_first_request_is_hedged_with_the_default_budget() -> None:
+    hedger: Hedger = Hedger(budget=0.1, initial_delay=0.05)
+    sent: List[str] = []
+    start: float = time.perf_counter()
+    response: Response = hedger.send(stalled_primary(sent), ROUTE, lambda route: MIRROR)
+    assert response.url == MIRROR
+    assert time.perf_counter() - start < 0.5
+    assert sent == [ROUTE, MIRROR]
+
+
+def test_losing_request_is_closed_when_it_finishes() -> None:
+    hedger: Hedger = Hedger(initial_delay=0.05)
+    responses: List[Response] = []
+    hedger.send(stalled_primary([], responses), ROUTE, lambda route: MIRROR)
+    time.sleep(1.2)
+    assert [(response.url, response.closed) for response in responses] == [
+        (MIRROR, False),
+        (ROUTE, True),
+    ]
+
+
+def test_no_hedge_beyond_the_budget() -> None:
+    hedger: Hedger = Hedger(budget=0.0, burst=0, initial_delay=0.05)
+    sent: List[str] = []
+    response: Response = hedger.send(stalled_primary(sent), ROUTE, lambda route: MIRROR)
+    assert response.url == ROUTE
+    assert sent == [ROUTE]
+
+
+def test_no_hedge_without_a_delay() -> None:
+    hedger: Hedger = Hedger(initial_delay=None)
+    assert hedger.delay("films") is None
+
+
+def test_delay_follows_the_percentile_once_warm() -> None:
+    hedger: Hedger = Hedger(percentile=50.0, min_samples=4, initial_delay=1.0)
+    fast: Any = lambda url: Response(url)
+    for _ in range(4):
+        hedger.send(fast, ROUTE)
+    delay: Any = hedger.delay("films")
+    assert delay is not None and delay < 0.1
@@ -0,0 +1,35 @@
+from src.metrics import Histogram, endpoint_type
+
+
+def test_empty_histogram_quantile_is_zero() -> None:
+    assert Histogram((1.0, float("inf"))).quantile(0.5) == 0.0
+
+
+def test_quantile_interpolates_inside_the_bucket() -> None:
+    histogram: Histogram = Histogram((1.0, 2.0, float("inf")))
+    for value in (0.5, 0.5, 1.5, 1.5):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(0.75) == 1.5
+    assert histogram.quantile(1.0) == 2.0
+
+
+def test_quantile_beyond_the_last_bound_is_that_bound() -> None:
+    histogram: Histogram = Histogram((1.0, 2.0, float("inf")))
+    histogram.observe(50.0)
+    assert histogram.quantile(0.99) == 2.0
+
+
+def test_merge_adds_the_buckets() -> None:
+    left: Histogram = Histogram((1.0, float("inf")))
+    right: Histogram = Histogram((1.0, float("inf")))
+    left.observe(0.5)
+    right.observe(3.0)
+    left.merge(right)
+    assert (left.count, left.sum, left.buckets) == (2, 3.5, [1, 1])
+
+
+def test_endpoint_type_ignores_the_host() -> None:
+    assert endpoint_type("https://swapi.dev/api/films/1/") == "films"
+    assert endpoint_type("http://127.0.0.1:8765/api/people/?page=2") == "people"
+    assert endpoint_type("https://swapi.dev/api/") == "root"
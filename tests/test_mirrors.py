@@ -0,0 +1,74 @@
+import time
+
+from src.mirrors import MirrorPool
+
+A: str = "http://a.test/api"
+B: str = "http://b.test/api"
+SWAPI: str = "https://swapi.dev/api"
+
+
+def pool(cooldown: float = 0.2) -> MirrorPool:
+    return MirrorPool([A, B], aliases=[SWAPI], max_failures=2, cooldown=cooldown)
+
+
+def test_rewrite_between_mirrors() -> None:
+    mirrors: MirrorPool = pool()
+    assert mirrors.split(f"{SWAPI}/films/1/") == (SWAPI, "/films/1/")
+    assert mirrors.rewrite(f"{SWAPI}/films/1/", B) == f"{B}/films/1/"
+    assert mirrors.rewrite("https://other.test/x", B) == "https://other.test/x"
+    payload: bytes = (
+        f'{{"url": "{A}/films/1/", "next": "{SWAPI}/films/?page=2"}}'.encode()
+    )
+    assert mirrors.rewrite_payload(payload, B) == (
+        f'{{"url": "{B}/films/1/", "next": "{B}/films/?page=2"}}'.encode()
+    )
+
+
+def test_fastest_mirror_is_chosen() -> None:
+    mirrors: MirrorPool = pool()
+    mirrors.observe(A, 0.5, True)
+    # A mirror without a latency is measured first.
+    assert mirrors.choose() == B
+    mirrors.observe(B, 0.1, True)
+    assert mirrors.choose() == B
+    assert mirrors.alternate(f"{B}/films/1/") == f"{A}/films/1/"
+
+
+def test_failing_mirror_is_ejected_then_probed() -> None:
+    mirrors: MirrorPool = pool()
+    mirrors.observe(B, 0.1, True)
+    mirrors.observe(A, 0.01, False)
+    mirrors.observe(A, 0.01, False)
+    assert mirrors.choose() == B
+    time.sleep(0.25)
+    # The probe is reserved: only one request goes to the mirror until it is observed.
+    assert mirrors.choose() == A
+    assert mirrors.choose() == B
+    mirrors.observe(A, 0.01, True)
+    assert mirrors.choose() == A
+
+
+def test_failed_probe_doubles_the_cooldown() -> None:
+    mirrors: MirrorPool = pool()
+    mirrors.observe(B, 0.1, True)
+    mirrors.observe(A, 0.01, False)
+    mirrors.observe(A, 0.01, False)
+    time.sleep(0.25)
+    assert mirrors.choose() == A
+    mirrors.observe(A, 0.01, False)
+    time.sleep(0.25)
+    assert mirrors.choose() == B
+    time.sleep(0.2)
+    assert mirrors.choose() == A
+
+
+def test_failures_while_every_mirror_is_ejected_do_not_back_off() -> None:
+    mirrors: MirrorPool = pool()
+    for base in (A, B):
+        mirrors.observe(base, 0.01, False)
+        mirrors.observe(base, 0.01, False)
+    for _ in range(20):
+        mirrors.observe(mirrors.choose(), 0.01, False)
+    time.sleep(0.25)
+    # Both mirrors are due for a probe after the initial cooldown.
+    assert {mirrors.choose(), mirrors.choose()} == {A, B}